@@ -0,0 +1,79 @@
+import os
+
+# Cache backend shared by the crawlers: "memory" (per worker) or "sqlite" (shared by every worker)
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+CACHE_PATH = os.environ.get('CACHE_PATH', '/tmp/cse_crawler_cache.sqlite3')
+
+# Expired cache entries are still served for this long while they are refreshed in the background, 0 disables it
+CACHE_STALE_GRACE_SECONDS = int(os.environ.get('CACHE_STALE_GRACE_SECONDS', 600))
+
+# Background warmer keeping every board fresh, only one worker per host runs it.
+# WARMER_PAGES is how deep a board is crawled the first time, later runs only fetch new posts
+WARMER_ENABLED = os.environ.get('WARMER_ENABLED', '1') == '1'
+WARMER_PAGES = int(os.environ.get('WARMER_PAGES', 2))
+WARMER_INTERVAL_SECONDS = int(os.environ.get('WARMER_INTERVAL_SECONDS', 240))
+WARMER_HOST_DELAY_SECONDS = float(os.environ.get('WARMER_HOST_DELAY_SECONDS', 1.0))
+WARMER_JITTER_SECONDS = float(os.environ.get('WARMER_JITTER_SECONDS', 2.0))
+WARMER_LOCK_PATH = os.environ.get('WARMER_LOCK_PATH', '/tmp/cse_crawler_warmer.lock')
+
+# Parsed articles are cached by normalized URL within a byte budget
+ARTICLE_CACHE_MAX_LEN = int(os.environ.get('ARTICLE_CACHE_MAX_LEN', 5000))
+ARTICLE_CACHE_MAX_BYTES = int(os.environ.get('ARTICLE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+ARTICLE_CACHE_MAX_AGE_SECONDS = int(os.environ.get('ARTICLE_CACHE_MAX_AGE_SECONDS', 3600))
+
+# HTML parser backend used by every crawler: "html.parser" or "lxml", tests/test_html_parser.py checks they agree
+HTML_PARSER = os.environ.get('HTML_PARSER', 'html.parser')
+
+# HTML extraction runs in this pool ("process", "thread" or "inline") so the event loop keeps serving
+PARSE_POOL_KIND = os.environ.get('PARSE_POOL_KIND', 'process')
+PARSE_POOL_WORKERS = int(os.environ.get('PARSE_POOL_WORKERS', 2))
+PARSE_POOL_MAX_QUEUE = int(os.environ.get('PARSE_POOL_MAX_QUEUE', 16))
+
+# Validators, content hash and parse result of every fetched upstream page, used to skip unchanged pages
+PAGE_CACHE_MAX_LEN = int(os.environ.get('PAGE_CACHE_MAX_LEN', 5000))
+PAGE_CACHE_MAX_BYTES = int(os.environ.get('PAGE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+PAGE_CACHE_MAX_AGE_SECONDS = int(os.environ.get('PAGE_CACHE_MAX_AGE_SECONDS', 86400))
+
+# Defaults for boards in crawler/registry.py, a board can override its own max age
+BOARD_MAX_AGE_SECONDS = int(os.environ.get('BOARD_MAX_AGE_SECONDS', 300))
+BOARD_CACHE_PAGES = int(os.environ.get('BOARD_CACHE_PAGES', 10))
+
+# Board TTLs adapt to how often the first page changes, staying within these bounds
+ADAPTIVE_TTL_MIN_SECONDS = int(os.environ.get('ADAPTIVE_TTL_MIN_SECONDS', 60))
+ADAPTIVE_TTL_MAX_SECONDS = int(os.environ.get('ADAPTIVE_TTL_MAX_SECONDS', 3600))
+ADAPTIVE_TTL_GROWTH = float(os.environ.get('ADAPTIVE_TTL_GROWTH', 1.5))
+
+# Per board last page and newest post number, the pagination is parsed again after this long
+BOARD_META_REVALIDATE_SECONDS = int(os.environ.get('BOARD_META_REVALIDATE_SECONDS', 86400))
+
+# Posts, list pages and articles are persisted here, stored pages are served up to this long past their max age
+POST_STORE_PATH = os.environ.get('POST_STORE_PATH', '/tmp/cse_crawler_posts.sqlite3')
+POST_STORE_MAX_STALE_SECONDS = int(os.environ.get('POST_STORE_MAX_STALE_SECONDS', 86400))
+
+# The incremental crawler walks down from the first page until it reaches a known post, at most this many pages
+INCREMENTAL_MAX_PAGES = int(os.environ.get('INCREMENTAL_MAX_PAGES', 10))
+
+# Results per page of /v2/search/
+SEARCH_PAGE_SIZE = int(os.environ.get('SEARCH_PAGE_SIZE', 20))
+
+# Cross board feed and cursor pagination: largest page a client can ask for, and how many list pages of each board
+# one request may crawl when the stored stream runs short
+FEED_MAX_LIMIT = int(os.environ.get('FEED_MAX_LIMIT', 100))
+FEED_MAX_PAGES = int(os.environ.get('FEED_MAX_PAGES', 20))
+
+# POST /v2/articles/: most articles per request, and how many of them are fetched from one host at a time
+BATCH_MAX_ARTICLES = int(os.environ.get('BATCH_MAX_ARTICLES', 50))
+BATCH_HOST_CONCURRENCY = int(os.environ.get('BATCH_HOST_CONCURRENCY', 4))
+
+# Responses of at least RESPONSE_COMPRESS_MIN_BYTES are compressed with these codings ("gzip", "br"),
+# pre-serialized list pages and articles are kept precompressed
+RESPONSE_COMPRESS = [coding for coding in os.environ.get('RESPONSE_COMPRESS', 'gzip').split(',') if coding]
+RESPONSE_COMPRESS_MIN_BYTES = int(os.environ.get('RESPONSE_COMPRESS_MIN_BYTES', 1024))
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+# Length of the article body returned with format=summary
+ARTICLE_SUMMARY_CHARS = int(os.environ.get('ARTICLE_SUMMARY_CHARS', 200))
+
+# preview=true on list endpoints: length of each post's preview, and how long a request waits for missing articles
+PREVIEW_CHARS = int(os.environ.get('PREVIEW_CHARS', 80))
+PREVIEW_BUDGET_SECONDS = float(os.environ.get('PREVIEW_BUDGET_SECONDS', 0.5))
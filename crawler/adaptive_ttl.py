@@ -0,0 +1,50 @@
+import hashlib
+import json
+import time
+
+import config
+from crawler.board_meta import SQLiteMetaStore
+
+# Per board TTL and signature of its first page. They go in the post store's SQLite file whatever CACHE_BACKEND is,
+# so workers that never crawled a board still judge its shared stored pages by the TTL it learned
+ttl_store = SQLiteMetaStore(config.POST_STORE_PATH, 'board_ttl')
+
+
+def signature(posts: list):
+    # View counts change on every crawl and do not mean the board was updated
+    rows = [[post.get('num'), post.get('title'), post.get('write_date'), post.get('article_url')] for post in posts]
+    return hashlib.sha1(json.dumps(rows, ensure_ascii=False).encode()).hexdigest()
+
+
+def current(board_key: str, default: int):
+    state = ttl_store.get(board_key)
+    return state['ttl'] if state is not None else default
+
+
+def observe(board_key: str, posts: list, default: int):
+    state = ttl_store.get(board_key)
+    new_signature = signature(posts)
+
+    if state is None:
+        ttl = default
+    elif state['signature'] == new_signature:
+        ttl = min(state['ttl'] * config.ADAPTIVE_TTL_GROWTH, config.ADAPTIVE_TTL_MAX_SECONDS)
+    else:
+        ttl = max(state['ttl'] / 2, config.ADAPTIVE_TTL_MIN_SECONDS)
+
+    ttl = int(ttl)
+    ttl_store.set(board_key, {
+        'ttl': ttl,
+        'signature': new_signature,
+        'changed_at': time.time() if state is None or state['signature'] != new_signature else state['changed_at'],
+    })
+
+    return ttl
+
+
+def max_age(board_key: str, page: int, posts: list, default: int):
+    # Only the first page tells whether the board got new posts, deeper pages follow its TTL
+    if page == 1:
+        return observe(board_key, posts, default)
+
+    return current(board_key, default)
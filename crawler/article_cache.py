@@ -0,0 +1,57 @@
+import config
+from crawler import singleflight
+from crawler.cache import create_cache
+from crawler.post_store import store
+from crawler.urls import normalize_url
+
+article_cache = create_cache('article', max_len=config.ARTICLE_CACHE_MAX_LEN,
+                             max_age_seconds=config.ARTICLE_CACHE_MAX_AGE_SECONDS,
+                             max_bytes=config.ARTICLE_CACHE_MAX_BYTES)
+
+
+async def get_article(url: str, crawl):
+    key = normalize_url(url)
+    entry = article_cache.get_entry(key)
+
+    # Articles persisted by an earlier crawl are served without going upstream
+    if entry is None:
+        entry = store.article(key, config.ARTICLE_CACHE_MAX_AGE_SECONDS)
+        if entry is not None:
+            article_cache.set(key, entry.value, max(config.ARTICLE_CACHE_MAX_AGE_SECONDS - entry.age, 0))
+
+    if entry is None:
+        return await singleflight.do(f'article_{key}', store_article, key, url, crawl)
+
+    # Serve stale entries right away and refresh them in the background
+    if entry.stale:
+        singleflight.do_in_background(f'article_{key}', store_article, key, url, crawl)
+
+    return entry.value
+
+
+def peek(url: str):
+    # The cached or stored article, even a stale one, without going upstream or refreshing it
+    key = normalize_url(url)
+    entry = article_cache.lookup(key) or store.article(key, config.ARTICLE_CACHE_MAX_AGE_SECONDS)
+
+    return entry.value if entry is not None else None
+
+
+def fresh_age(url: str):
+    # How old the cached copy of an article is, None when there is none or it is stale
+    entry = article_cache.lookup(normalize_url(url))
+    if entry is None or entry.stale:
+        return None
+
+    return entry.age
+
+
+async def store_article(key: str, url: str, crawl):
+    article = await crawl(url)
+
+    # Only successfully parsed articles are cached and persisted
+    if isinstance(article, dict) and article.get('status_code') == 200:
+        article_cache.set(key, article)
+        store.store_article(key, article)
+
+    return article
@@ -0,0 +1,68 @@
+import re
+
+import config
+from crawler.post_store import plain_text
+
+# Blocks whose content is never shown as text
+hidden_blocks = re.compile(r'<(style|script)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+# Images inlined as base64 data are often larger than the rest of the article
+inline_images = re.compile(r'<img\b[^>]*\bsrc\s*=\s*["\']?data:[^>]*>', re.IGNORECASE)
+presentation_attributes = re.compile(r'\s(?:style|class|width|height|align|bgcolor|face|size)\s*=\s*'
+                                     r'(?:"[^"]*"|\'[^\']*\'|[^\s>]+)', re.IGNORECASE)
+comments = re.compile(r'<!--.*?-->', re.DOTALL)
+
+
+def stripped(text: str):
+    text = comments.sub('', hidden_blocks.sub('', text or ''))
+    text = inline_images.sub('', text)
+    text = presentation_attributes.sub('', text)
+    # Empty spans and fonts are left behind once their styling is gone
+    text = re.sub(r'<(span|font)>(.*?)</\1>', r'\2', text, flags=re.IGNORECASE | re.DOTALL)
+
+    return text.strip()
+
+
+def text_only(text: str):
+    return plain_text(hidden_blocks.sub('', text or ''))
+
+
+def summary(text: str, length: int = None):
+    length = length or config.ARTICLE_SUMMARY_CHARS
+    text = text_only(text)
+    if len(text) <= length:
+        return text
+
+    # Cut at the last space inside the limit so no word is split
+    cut = text[:length]
+    return (cut.rsplit(' ', 1)[0] if ' ' in cut else cut) + '…'
+
+
+# format parameter of the article endpoints, "html" is the body as upstream has it
+formats = {
+    'html': None,
+    'stripped': stripped,
+    'text': text_only,
+    'summary': summary,
+}
+
+
+def parse_fields(fields: str):
+    if fields is None:
+        return None
+
+    return [field.strip() for field in fields.split(',') if field.strip()]
+
+
+def shape(article, format: str = 'html', fields: list = None):
+    # Only parsed articles have a body to reshape
+    if not isinstance(article, dict) or article.get('status_code') != 200:
+        return article
+
+    article = dict(article)
+    if formats[format] is not None:
+        article['text'] = formats[format](article.get('text'))
+
+    if fields is not None:
+        article = {key: value for key, value in article.items() if key == 'status_code' or key in fields}
+
+    return article
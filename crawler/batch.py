@@ -0,0 +1,57 @@
+import asyncio
+import logging
+from urllib.parse import urlsplit
+
+import httpx
+
+import config
+from crawler import registry
+from crawler.urls import normalize_url
+from crawler.v2.crawlers import crawl_article
+
+logger = logging.getLogger(__name__)
+
+# One semaphore per upstream host, shared by every batch running in this worker
+host_semaphores = {}
+
+
+def host_semaphore(url: str):
+    host = urlsplit(url).netloc.lower()
+    if host not in host_semaphores:
+        host_semaphores[host] = asyncio.Semaphore(config.BATCH_HOST_CONCURRENCY)
+
+    return host_semaphores[host]
+
+
+async def fetch_article(url: str):
+    kind = registry.kind_of_url(url)
+    if kind is None:
+        return {'status_code': 400}
+
+    # One unreachable article must not fail the rest of the batch
+    try:
+        async with host_semaphore(url):
+            article = await crawl_article(kind, url)
+    except httpx.HTTPError:
+        return {'status_code': 502}
+    except Exception:
+        # e.g. a parser failing on an unexpected page layout
+        logger.exception("Batch article %s failed", url)
+        return {'status_code': 500}
+
+    # Articles that cannot be parsed come back in the legacy list shape
+    if isinstance(article, list):
+        article = article[0]
+
+    return article
+
+
+async def fetch_articles(urls: list):
+    # The same article linked twice, e.g. from another list page, is only fetched once
+    keys = [normalize_url(url) for url in urls]
+    unique = dict(zip(keys, urls))
+
+    results = await asyncio.gather(*[fetch_article(url) for url in unique.values()])
+    articles = dict(zip(unique.keys(), results))
+
+    return [{'url': url, **articles[key]} for url, key in zip(urls, keys)]
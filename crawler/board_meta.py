@@ -0,0 +1,115 @@
+import json
+import math
+import threading
+import time
+
+import config
+from crawler.database import Database
+
+
+class MemoryMetaStore:
+    # One small record per board, so nothing is ever evicted
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            meta = self._data.get(key)
+            return dict(meta) if meta is not None else None
+
+    def set(self, key: str, meta: dict):
+        with self._lock:
+            self._data[key] = dict(meta)
+
+    def items(self):
+        with self._lock:
+            return sorted((key, dict(meta)) for key, meta in self._data.items())
+
+
+class SQLiteMetaStore:
+    # Kept next to the cache entries but in its own table, untouched by cache pruning
+    def __init__(self, path: str = None, table: str = 'board_meta'):
+        self.path = path or config.CACHE_PATH
+        self.table = table
+        self._database = Database(self.path, self._create_tables)
+
+    def _connect(self):
+        return self._database.connect()
+
+    def _create_tables(self, connection):
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {self.table} (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def get(self, key: str):
+        row = self._connect().execute(f"SELECT value FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, meta: dict):
+        self._connect().execute(f"INSERT OR REPLACE INTO {self.table} (key, value) VALUES (?, ?)",
+                                (key, json.dumps(meta)))
+
+    def items(self):
+        rows = self._connect().execute(f"SELECT key, value FROM {self.table} ORDER BY key").fetchall()
+        return [(key, json.loads(value)) for key, value in rows]
+
+
+stores = {
+    'memory': MemoryMetaStore,
+    'sqlite': SQLiteMetaStore,
+}
+
+store = stores[config.CACHE_BACKEND]()
+
+
+def get(board_key: str):
+    return store.get(board_key)
+
+
+def last_page(board_key: str):
+    meta = store.get(board_key)
+    return meta['last_page'] if meta is not None else None
+
+
+def needs_last_page(board_key: str):
+    # The pagination is only parsed again once a day, in between new posts move the last page along
+    meta = store.get(board_key)
+    return meta is None or meta['last_page'] is None or \
+        time.time() - meta['last_page_checked_at'] >= config.BOARD_META_REVALIDATE_SECONDS
+
+
+def numbered(posts: list):
+    # Headline posts have no number and are left out of the counts
+    return [int(post['num']) for post in posts if str(post.get('num', '')).isdigit()]
+
+
+def update(board_key: str, page: int, posts: list, parsed_last_page: int = None):
+    now = time.time()
+    meta = store.get(board_key) or {'last_page': None, 'last_page_checked_at': None, 'post_count': None,
+                                    'newest_num': None, 'checked_at': None}
+    nums = numbered(posts) if page == 1 else []
+    newest_num = max(nums) if nums else None
+
+    if parsed_last_page is not None:
+        meta['last_page'] = parsed_last_page
+        meta['last_page_checked_at'] = now
+
+    if newest_num is not None:
+        if parsed_last_page is None and meta['last_page'] is not None and meta['post_count'] is not None \
+                and newest_num > meta['newest_num']:
+            # Posts are numbered in order, so new posts at the top push older ones towards the last page
+            post_count = meta['post_count'] + newest_num - meta['newest_num']
+            meta['last_page'] += math.ceil(post_count / len(nums)) - math.ceil(meta['post_count'] / len(nums))
+            meta['post_count'] = post_count
+        elif parsed_last_page is not None or meta['post_count'] is None:
+            meta['post_count'] = newest_num
+
+        meta['newest_num'] = newest_num
+
+    meta['checked_at'] = now
+    store.set(board_key, meta)
+
+    return meta['last_page']
+
+
+def items():
+    return store.items()
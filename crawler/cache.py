@@ -0,0 +1,207 @@
+import json
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import config
+from crawler.database import Database
+
+# age is in seconds, stale entries are past their max age but still inside the grace window
+CacheEntry = namedtuple('CacheEntry', ['value', 'age', 'stale'])
+
+
+class CacheBackend:
+    def __init__(self, name: str, max_len: int, max_age_seconds: int, max_bytes: int = None):
+        self.name = name
+        self.max_len = max_len
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self.stale_grace_seconds = config.CACHE_STALE_GRACE_SECONDS
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        entry = self.get_entry(key)
+        if entry is None or entry.stale:
+            return None
+
+        return entry.value
+
+    def get_entry(self, key: str):
+        entry = self.lookup(key)
+
+        if entry is None:
+            self.misses += 1
+        elif entry.stale:
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+
+        return entry
+
+    def lookup(self, key: str):
+        raise NotImplementedError
+
+    def set(self, key: str, value, max_age_seconds: int = None):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def __setitem__(self, key: str, value):
+        self.set(key, value)
+
+    def size(self):
+        raise NotImplementedError
+
+    def stats(self):
+        entries, size = self.size()
+
+        return {
+            'name': self.name,
+            'entries': entries,
+            'bytes': size,
+            'max_len': self.max_len,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+        }
+
+
+class MemoryCache(CacheBackend):
+    # In-process LRU cache, every worker keeps its own copy
+    def __init__(self, name: str, max_len: int, max_age_seconds: int, max_bytes: int = None):
+        super().__init__(name, max_len, max_age_seconds, max_bytes)
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, key: str):
+        now = time.time()
+
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+
+            value, stored_at, expires_at, size = entry
+            if expires_at + self.stale_grace_seconds <= now:
+                self._remove(key)
+                return None
+
+            self._data.move_to_end(key)
+            return CacheEntry(value, now - stored_at, expires_at <= now)
+
+    def set(self, key: str, value, max_age_seconds: int = None):
+        if max_age_seconds is None:
+            max_age_seconds = self.max_age_seconds
+
+        # Sizes are only measured when there is a byte budget to enforce
+        size = self.measure(value) if self.max_bytes else 0
+        now = time.time()
+
+        with self._lock:
+            self._remove(key)
+            self._data[key] = (value, now, now + max_age_seconds, size)
+            self._bytes += size
+            while len(self._data) > self.max_len or (self.max_bytes and self._bytes > self.max_bytes):
+                self._remove(next(iter(self._data)))
+
+    def measure(self, value):
+        return len(json.dumps(value, ensure_ascii=False).encode())
+
+    def _remove(self, key: str):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[3]
+
+    def delete(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def size(self):
+        return len(self._data), self._bytes
+
+
+class SQLiteCache(CacheBackend):
+    # Cache stored in a local SQLite file, shared by every gunicorn worker on the host
+    def __init__(self, name: str, max_len: int, max_age_seconds: int, max_bytes: int = None, path: str = None):
+        super().__init__(name, max_len, max_age_seconds, max_bytes)
+        self.path = path or config.CACHE_PATH
+        self._database = Database(self.path, self._create_tables)
+
+    def _connect(self):
+        return self._database.connect()
+
+    def _create_tables(self, connection):
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "stored_at REAL NOT NULL, accessed_at REAL NOT NULL, expires_at REAL NOT NULL, "
+            "PRIMARY KEY (namespace, key))")
+
+    def lookup(self, key: str):
+        now = time.time()
+        connection = self._connect()
+        row = connection.execute(
+            "SELECT value, stored_at, expires_at FROM cache_entries "
+            "WHERE namespace = ? AND key = ? AND expires_at > ?",
+            (self.name, key, now - self.stale_grace_seconds)).fetchone()
+
+        if row is None:
+            return None
+
+        value, stored_at, expires_at = row
+        connection.execute("UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                           (now, self.name, key))
+        return CacheEntry(json.loads(value), now - stored_at, expires_at <= now)
+
+    def set(self, key: str, value, max_age_seconds: int = None):
+        if max_age_seconds is None:
+            max_age_seconds = self.max_age_seconds
+
+        now = time.time()
+        data = json.dumps(value, ensure_ascii=False)
+        connection = self._connect()
+        connection.execute(
+            "INSERT OR REPLACE INTO cache_entries "
+            "(namespace, key, value, size, stored_at, accessed_at, expires_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (self.name, key, data, len(data.encode()), now, now, now + max_age_seconds))
+        # Keep at most max_len rows per namespace, dropping ones past the grace window and the least recently used first
+        connection.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND (expires_at <= ? OR key NOT IN "
+            "(SELECT key FROM cache_entries WHERE namespace = ? ORDER BY accessed_at DESC LIMIT ?))",
+            (self.name, now - self.stale_grace_seconds, self.name, self.max_len))
+
+        if self.max_bytes:
+            connection.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+                "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS total "
+                "FROM cache_entries WHERE namespace = ?) WHERE total > ?)",
+                (self.name, self.name, self.max_bytes))
+
+    def delete(self, key: str):
+        self._connect().execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (self.name, key))
+
+    def size(self):
+        return tuple(self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?",
+            (self.name,)).fetchone())
+
+
+backends = {
+    'memory': MemoryCache,
+    'sqlite': SQLiteCache,
+}
+
+
+caches = []
+
+
+def create_cache(name: str, max_len: int, max_age_seconds: int, max_bytes: int = None):
+    cache = backends[config.CACHE_BACKEND](name, max_len, max_age_seconds, max_bytes)
+    caches.append(cache)
+
+    return cache
@@ -0,0 +1,24 @@
+import base64
+import binascii
+import json
+
+
+# Cursors are the sort key of the last post a client received, opaque to the client
+def encode(key: tuple):
+    return base64.urlsafe_b64encode(json.dumps(list(key), ensure_ascii=False).encode()).decode().rstrip('=')
+
+
+def decode(cursor: str):
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        return None
+
+    # Keys are (write_date, board, num, article_url), anything else was not made by encode
+    if not isinstance(key, list) or len(key) != 4:
+        return None
+    if not all(isinstance(item, str) for item in (key[0], key[1], key[3])) or \
+            not isinstance(key[2], int) or isinstance(key[2], bool):
+        return None
+
+    return tuple(key)
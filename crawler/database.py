@@ -0,0 +1,25 @@
+import os
+import sqlite3
+
+
+class Database:
+    # Connection to a SQLite file shared by every gunicorn worker, setup creates the tables of a new connection
+    def __init__(self, path: str, setup=None):
+        self.path = path
+        self.setup = setup
+        self._connection = None
+        self._pid = None
+
+    def connect(self):
+        # Connections must not be shared across forked workers
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            if self.setup is not None:
+                self.setup(connection)
+
+            self._connection = connection
+            self._pid = os.getpid()
+
+        return self._connection
@@ -0,0 +1,91 @@
+import asyncio
+import heapq
+import sys
+
+import config
+from crawler import registry
+from crawler.post_store import store, stream_key
+from crawler.v2.crawlers import board_key, crawl_board
+
+
+def post_key(board: registry.Board, post: dict):
+    # Newest first, ties broken by board, post number and URL so every post has its own place in the stream
+    write_date, num, article_url = stream_key(post)
+    return write_date, board.name, num, article_url
+
+
+def stream_bound(board: registry.Board, after: tuple):
+    # The cursor as a stream key of this board, its posts sorting below the bound sort below the cursor
+    if after is None:
+        return None
+
+    write_date, name, num, article_url = after
+    if name == board.name:
+        return write_date, num, article_url
+
+    # Boards sorting before the cursor's board keep all their posts of the cursor's date, boards after it none.
+    # Post numbers are never below -1
+    return (write_date, sys.maxsize, '') if board.name < name else (write_date, -2, '')
+
+
+async def walk(board: registry.Board, page: int):
+    # A cached copy of a deeper page may predate posts already walked and skip the ones in between, those pages
+    # are crawled once from upstream instead
+    result = await crawl_board(board, page, refresh=page > 1)
+    if result.get('status_code') != 200 or result.get('last_page', -1) < page:
+        return False
+
+    return store.walk(board_key(board), page, result['posts'], result['last_page'])
+
+
+async def board_stream(board: registry.Board, after: tuple, limit: int):
+    # Up to limit + 1 posts of the board below the cursor, served from the post store. List pages are only
+    # crawled when the stored stream runs short, at most FEED_MAX_PAGES per request. Also returns whether the
+    # stream was cut short because older posts could not be loaded
+    key = board_key(board)
+    bound = stream_bound(board, after)
+
+    # Reading from the top picks up the newest posts first
+    if after is None:
+        await walk(board, 1)
+
+    for _ in range(config.FEED_MAX_PAGES):
+        posts, next_page = store.stream(key, bound, limit + 1)
+        if len(posts) > limit or next_page is None:
+            return posts, False
+        if not await walk(board, next_page):
+            return posts, True
+
+    posts, next_page = store.stream(key, bound, limit + 1)
+    return posts, len(posts) <= limit and next_page is not None
+
+
+async def collect(boards: list, after: tuple, limit: int):
+    # Merges the streams of every board, loaded concurrently. Returns the posts, the key to continue after and
+    # whether a board's stream was cut short, in which case the client should come back for the rest
+    streams = await asyncio.gather(*[board_stream(board, after, limit) for board in boards])
+    truncated = any(cut for _, cut in streams)
+
+    # A cut short board that returned nothing may have posts right below the cursor, nothing can be sent yet
+    if any(cut and not posts for posts, cut in streams):
+        return [], after, True
+
+    keyed = [[(post_key(board, post), board, post) for post in posts] for board, (posts, _) in zip(boards, streams)]
+
+    # Posts of a cut short board may be missing below the last one it returned, nothing past it is sent yet
+    floor = max((items[-1][0] for items, (_, cut) in zip(keyed, streams) if cut), default=None)
+
+    merged = []
+    for key, board, post in heapq.merge(*keyed, key=lambda item: item[0], reverse=True):
+        if floor is not None and key < floor:
+            break
+        merged.append((key, board, post))
+        if len(merged) > limit:
+            break
+
+    # One extra post tells whether there is a next page
+    has_next = len(merged) > limit or truncated
+    merged = merged[:limit]
+    next_key = (merged[-1][0] if merged else after) if has_next else None
+
+    return [(board, post) for key, board, post in merged], next_key, truncated
@@ -0,0 +1,104 @@
+import hashlib
+import math
+import re
+
+import config
+from crawler import http_client, parse_pool
+from crawler.cache import create_cache
+
+page_cache = create_cache('upstream_page', max_len=config.PAGE_CACHE_MAX_LEN,
+                          max_age_seconds=config.PAGE_CACHE_MAX_AGE_SECONDS,
+                          max_bytes=config.PAGE_CACHE_MAX_BYTES)
+
+not_modified = 0
+unchanged = 0
+parsed = 0
+
+
+def fingerprint(html: str, region: tuple = None):
+    # region is (start marker, end marker, class of the view count cells to blank out)
+    if region is not None:
+        start_marker, end_marker, count_class = region
+        start = html.find(start_marker)
+        end = html.find(end_marker, start)
+
+        if start != -1 and end != -1:
+            html = html[start:end + len(end_marker)]
+            if count_class is not None:
+                html = re.sub(f'(class="[^"]*\\b{count_class}\\b[^"]*"[^>]*>)[^<]*', r'\1', html)
+
+    return hashlib.sha1(html.encode()).hexdigest()
+
+
+async def fetch_parsed(url: str, parse, *args, region: tuple = None):
+    global not_modified, unchanged, parsed
+
+    # The same URL can be asked for through another crawler's route, each parser keeps its own result
+    key = f'{parse.__module__}.{parse.__qualname__} {url}'
+    previous = page_cache.get(key)
+    # A stored result can only stand in for one parsed with the same arguments, its validators always apply
+    same_args = previous is not None and previous.get('args') == list(args)
+
+    headers = {}
+    if previous is not None:
+        if previous['etag']:
+            headers['If-None-Match'] = previous['etag']
+        if previous['last_modified']:
+            headers['If-Modified-Since'] = previous['last_modified']
+
+    response = await http_client.get(url, headers=headers)
+    if response.status_code == 304 and not same_args:
+        # Unchanged upstream, but the stored result was parsed with other arguments, e.g. without the pagination
+        response = await http_client.get(url)
+
+    if response.status_code == 304 and same_args:
+        not_modified += 1
+        result = previous['result']
+        digest = previous['hash']
+    elif response.status_code == 200:
+        # Without validators from upstream, an unchanged list region is detected by its fingerprint
+        digest = fingerprint(response.text, region)
+        if same_args and previous['hash'] == digest:
+            unchanged += 1
+            result = previous['result']
+        else:
+            parsed += 1
+            result = await parse_pool.run(parse, response.text, *args)
+    else:
+        return response.status_code, None
+
+    page_cache.set(key, {
+        'etag': response.headers.get('ETag') or (previous or {}).get('etag'),
+        'last_modified': response.headers.get('Last-Modified') or (previous or {}).get('last_modified'),
+        'hash': digest,
+        'args': list(args),
+        'result': result,
+    })
+
+    return 200, result
+
+
+def merge_pages(fetched: list, page_merge: int):
+    # Folds the (status_code, (last_page, posts)) results of the upstream pages making up one API page,
+    # the pagination is read from the first of them
+    for status_code, result in fetched:
+        if status_code != 200:
+            return status_code, None, None
+
+    posts = []
+    for upstream_last_page, upstream_posts in [result for status_code, result in fetched]:
+        if upstream_posts is None:
+            return 200, None, None
+
+        posts.extend(upstream_posts)
+
+    upstream_last_page = fetched[0][1][0]
+    return 200, math.ceil(upstream_last_page / page_merge) if upstream_last_page is not None else None, posts
+
+
+def stats():
+    return {
+        'not_modified': not_modified,
+        'unchanged': unchanged,
+        'parsed': parsed,
+    }
@@ -0,0 +1,21 @@
+from bs4 import BeautifulSoup
+
+import config
+
+
+def parse_bs4_html_parser(html: str):
+    return BeautifulSoup(html, 'html.parser')
+
+
+def parse_bs4_lxml(html: str):
+    return BeautifulSoup(html, 'lxml')
+
+
+parsers = {
+    'html.parser': parse_bs4_html_parser,
+    'lxml': parse_bs4_lxml,
+}
+
+
+def parse(html: str):
+    return parsers[config.HTML_PARSER](html)
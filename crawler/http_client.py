@@ -0,0 +1,36 @@
+import httpx
+
+# Shared keep-alive connection pool for every crawler, opened on app startup and closed on shutdown
+client = None
+
+TIMEOUT_SECONDS = 10
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+
+
+async def start():
+    global client
+
+    if client is None:
+        client = httpx.AsyncClient(
+            verify=False,
+            follow_redirects=True,
+            timeout=TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS,
+                                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS)
+        )
+
+
+async def close():
+    global client
+
+    if client is not None:
+        await client.aclose()
+        client = None
+
+
+async def get(url: str, headers: dict = None):
+    if client is None:
+        await start()
+
+    return await client.get(url, headers=headers)
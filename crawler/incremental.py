@@ -0,0 +1,33 @@
+import asyncio
+
+import config
+from crawler import board_meta, registry
+from crawler.post_store import store
+from crawler.v2.crawlers import board_key, crawl_board
+
+
+async def crawl_new_posts(board: registry.Board):
+    # Walks down from the first page until a page reaches a post that is already stored
+    key = board_key(board)
+    known_num = store.highest_num(key)
+    max_pages = config.WARMER_PAGES if known_num is None else config.INCREMENTAL_MAX_PAGES
+
+    board_status = {'pages': 0, 'new_posts': 0, 'error': None}
+    for page in range(1, max_pages + 1):
+        result = await crawl_board(board, page, refresh=True)
+        board_status['pages'] = page
+        if result.get('status_code') != 200:
+            board_status['error'] = f"status_code {result.get('status_code')}"
+            break
+
+        # The crawl itself stores the posts, new ones are told apart by their number
+        nums = board_meta.numbered(result['posts'])
+        board_status['new_posts'] += len([num for num in nums if known_num is None or num > known_num])
+
+        if known_num is not None and (not nums or min(nums) <= known_num):
+            break
+        if result.get('last_page', -1) <= page:
+            break
+        await asyncio.sleep(config.WARMER_HOST_DELAY_SECONDS)
+
+    return board_status
@@ -0,0 +1,57 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import config
+
+executor = None
+
+# Jobs submitted to the pool and not finished yet
+queue_depth = 0
+pool_runs = 0
+inline_runs = 0
+
+
+def start():
+    global executor
+
+    if executor is None:
+        if config.PARSE_POOL_KIND == 'process':
+            executor = ProcessPoolExecutor(max_workers=config.PARSE_POOL_WORKERS)
+        elif config.PARSE_POOL_KIND == 'thread':
+            executor = ThreadPoolExecutor(max_workers=config.PARSE_POOL_WORKERS)
+
+
+def stop():
+    global executor
+
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+        executor = None
+
+
+async def run(func, *args):
+    global queue_depth, pool_runs, inline_runs
+
+    # Parse on the event loop when there is no pool or it is saturated
+    if executor is None or queue_depth >= config.PARSE_POOL_MAX_QUEUE:
+        inline_runs += 1
+        return func(*args)
+
+    queue_depth += 1
+    pool_runs += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    finally:
+        queue_depth -= 1
+
+
+def stats():
+    return {
+        'kind': config.PARSE_POOL_KIND,
+        'workers': config.PARSE_POOL_WORKERS,
+        'running': executor is not None,
+        'queue_depth': queue_depth,
+        'max_queue': config.PARSE_POOL_MAX_QUEUE,
+        'pool_runs': pool_runs,
+        'inline_runs': inline_runs,
+    }
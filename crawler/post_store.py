@@ -0,0 +1,348 @@
+import html
+import json
+import logging
+import re
+import sqlite3
+import time
+
+import config
+from crawler.cache import CacheEntry
+from crawler.database import Database
+from crawler.urls import normalize_url
+
+logger = logging.getLogger(__name__)
+
+
+def post_num(post: dict):
+    num = str(post.get('num', ''))
+    return int(num) if num.isdigit() else None
+
+
+def normalize_date(write_date: str):
+    # Boards write dates as 2022.01.02 or 2022-01-02, stored as 2022-01-02 so they sort
+    return re.sub(r'\D+', '-', (write_date or '').strip()).strip('-') or None
+
+
+def stream_key(post: dict):
+    # Place of a post in its board's stream, newest first: (write date, post number, article URL)
+    num = post_num(post)
+    return normalize_date(post.get('write_date')) or '', -1 if num is None else num, post['article_url']
+
+
+# Tags that break lines or cells. Any other tag may sit inside a word, e.g. <b>9월 5일</b>부터, and is dropped
+block_tags = re.compile(r'</?(?:address|article|blockquote|br|caption|dd|div|dl|dt|figcaption|figure|footer|h[1-6]|'
+                        r'header|hr|li|ol|p|pre|section|table|tbody|td|tfoot|th|thead|tr|ul)\b[^>]*>', re.IGNORECASE)
+
+# Bumped whenever plain_text changes, so the search index is built again from the stored articles
+search_index_version = 1
+
+
+def plain_text(text: str):
+    text = re.sub(r'<[^>]+>', '', block_tags.sub(' ', text or ''))
+    return re.sub(r'\s+', ' ', html.unescape(text)).strip()
+
+
+def like_pattern(term: str):
+    return '%' + re.sub(r'([\\%_])', r'\\\1', term) + '%'
+
+
+class PostStore:
+    # Every post, list page and article the crawlers have seen, kept on disk across restarts
+    def __init__(self, path: str = None):
+        self.path = path or config.POST_STORE_PATH
+        self._database = Database(self.path, self._create_tables)
+
+    def _connect(self):
+        return self._database.connect()
+
+    def _create_tables(self, connection):
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS posts ("
+            "board TEXT NOT NULL, article_url TEXT NOT NULL, num INTEGER, post TEXT NOT NULL, "
+            "indexed_at REAL NOT NULL, PRIMARY KEY (board, article_url))")
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(posts)")]
+        if 'write_date' not in columns:
+            connection.execute("ALTER TABLE posts ADD COLUMN write_date TEXT")
+        if 'url' not in columns:
+            connection.execute("ALTER TABLE posts ADD COLUMN url TEXT")
+        connection.execute("CREATE INDEX IF NOT EXISTS posts_url ON posts (url)")
+        connection.execute("CREATE INDEX IF NOT EXISTS posts_board_num ON posts (board, num)")
+        connection.execute("CREATE INDEX IF NOT EXISTS posts_board_write_date ON posts (board, write_date)")
+        connection.execute("CREATE INDEX IF NOT EXISTS posts_write_date ON posts (write_date)")
+        connection.execute("CREATE INDEX IF NOT EXISTS posts_stream ON posts "
+                           "(board, COALESCE(write_date, ''), COALESCE(num, -1), article_url)")
+        # How far each board's list pages were walked in order, head and floor are stream keys as JSON
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS streams ("
+            "board TEXT PRIMARY KEY, depth INTEGER NOT NULL, head TEXT, floor TEXT, complete INTEGER NOT NULL)")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "board TEXT NOT NULL, page INTEGER NOT NULL, last_page INTEGER NOT NULL, posts TEXT NOT NULL, "
+            "stored_at REAL NOT NULL, PRIMARY KEY (board, page))")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "url TEXT PRIMARY KEY, article TEXT NOT NULL, stored_at REAL NOT NULL)")
+        self.searchable = self._create_search_index(connection)
+
+    def _create_search_index(self, connection):
+        # SQLite before 3.34 has no trigram tokenizer, only search is unavailable then
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                exists = connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'search_index'").fetchone()
+                if exists and connection.execute("PRAGMA user_version").fetchone()[0] < search_index_version:
+                    connection.execute("DROP TABLE search_index")
+                    exists = False
+
+                if not exists:
+                    # Trigram tokens match any part of a Korean word, rows share their rowid with posts
+                    connection.execute(
+                        "CREATE VIRTUAL TABLE search_index USING fts5(title, writer, body, tokenize='trigram')")
+                    self._build_search_index(connection)
+                    connection.execute(f"PRAGMA user_version = {search_index_version}")
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            logger.warning("Search index unavailable, search is disabled", exc_info=True)
+            return False
+
+        return True
+
+    def _build_search_index(self, connection):
+        # Posts stored before the search index existed or before its text last changed
+        for rowid, article_url, post in connection.execute("SELECT rowid, article_url, post FROM posts").fetchall():
+            url = normalize_url(article_url)
+            post = json.loads(post)
+            connection.execute("UPDATE posts SET url = ? WHERE rowid = ?", (url, rowid))
+            connection.execute("INSERT INTO search_index (rowid, title, writer, body) VALUES (?, ?, ?, ?)",
+                               (rowid, post.get('title'), post.get('writer'), self._article_text(connection, url)))
+
+    def _article_text(self, connection, url: str):
+        row = connection.execute("SELECT article FROM articles WHERE url = ?", (url,)).fetchone()
+        return plain_text(json.loads(row[0]).get('text')) if row is not None else ''
+
+    def highest_num(self, board: str):
+        return self._connect().execute("SELECT MAX(num) FROM posts WHERE board = ?", (board,)).fetchone()[0]
+
+    def add(self, board: str, posts: list):
+        # Known posts only get their view count and title refreshed, returns how many posts were new
+        connection = self._connect()
+        now = time.time()
+
+        new = 0
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for post in posts:
+                data = json.dumps(post, ensure_ascii=False)
+                write_date = normalize_date(post.get('write_date'))
+                row = connection.execute("SELECT rowid, post FROM posts WHERE board = ? AND article_url = ?",
+                                         (board, post['article_url'])).fetchone()
+
+                if row is None:
+                    url = normalize_url(post['article_url'])
+                    cursor = connection.execute(
+                        "INSERT INTO posts (board, article_url, url, num, write_date, post, indexed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (board, post['article_url'], url, post_num(post), write_date, data, now))
+                    if self.searchable:
+                        connection.execute(
+                            "INSERT INTO search_index (rowid, title, writer, body) VALUES (?, ?, ?, ?)",
+                            (cursor.lastrowid, post.get('title'), post.get('writer'),
+                             self._article_text(connection, url)))
+                    new += 1
+                elif row[1] != data:
+                    rowid, previous = row
+                    previous = json.loads(previous)
+                    connection.execute("UPDATE posts SET num = ?, write_date = ?, post = ? WHERE rowid = ?",
+                                       (post_num(post), write_date, data, rowid))
+                    if self.searchable and \
+                            (previous.get('title'), previous.get('writer')) != (post.get('title'), post.get('writer')):
+                        connection.execute("UPDATE search_index SET title = ?, writer = ? WHERE rowid = ?",
+                                           (post.get('title'), post.get('writer'), rowid))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+        return new
+
+    def store_page(self, board: str, page: int, posts: list, last_page: int):
+        # A failed write only loses the persisted copy, the crawl that produced the page still succeeds
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO pages (board, page, last_page, posts, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (board, page, last_page, json.dumps(posts, ensure_ascii=False), time.time()))
+
+            return self.add(board, posts)
+        except sqlite3.Error:
+            logger.warning("Storing page %s of %s failed", page, board, exc_info=True)
+            return 0
+
+    def page(self, board: str, page: int, max_age_seconds: int):
+        # Returns the stored page as a cache entry and its last page, pages past the stale limit are not served
+        row = self._connect().execute(
+            "SELECT last_page, posts, stored_at FROM pages WHERE board = ? AND page = ? AND stored_at > ?",
+            (board, page, time.time() - max_age_seconds - config.POST_STORE_MAX_STALE_SECONDS)).fetchone()
+
+        if row is None:
+            return None
+
+        last_page, posts, stored_at = row
+        age = time.time() - stored_at
+        return CacheEntry(json.loads(posts), age, age >= max_age_seconds), last_page
+
+    def walk(self, board: str, page: int, posts: list, last_page: int):
+        # Pages 1 to depth were stored one after another, so every post between the head and the floor of the
+        # board's stream is in the posts table. Only the page after depth extends the walk
+        keys = [list(stream_key(post)) for post in posts if post_num(post) is not None]
+        last = 0 < last_page <= page
+        try:
+            self.add(board, posts)
+
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute("SELECT depth, head, floor, complete FROM streams WHERE board = ?",
+                                         (board,)).fetchone()
+                if row is not None:
+                    depth, head, floor, complete = row[0], json.loads(row[1]), json.loads(row[2]), bool(row[3])
+
+                if page == 1 and (row is None or (keys and head is not None and min(keys) > head)):
+                    # More posts than a page came in since the head was last seen, the walk starts over
+                    depth, head, floor, complete = 1, max(keys, default=None), min(keys, default=None), last
+                elif page == 1 or (row is not None and page == depth + 1):
+                    depth, complete = max(depth, page), complete or last
+                    head = max([head] + keys) if head is not None else max(keys, default=None)
+                    floor = min([floor] + keys) if floor is not None else min(keys, default=None)
+                else:
+                    connection.execute("ROLLBACK")
+                    return False
+
+                connection.execute(
+                    "INSERT OR REPLACE INTO streams (board, depth, head, floor, complete) VALUES (?, ?, ?, ?, ?)",
+                    (board, depth, json.dumps(head, ensure_ascii=False), json.dumps(floor, ensure_ascii=False),
+                     int(complete)))
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            logger.warning("Walking page %s of %s failed", page, board, exc_info=True)
+            return False
+
+        return True
+
+    def stream(self, board: str, before: tuple, limit: int):
+        # Posts of the walked part of a board's stream that sort below before, newest first. Also returns the page
+        # that walks further, None once the walk reached the last page
+        connection = self._connect()
+        row = connection.execute("SELECT depth, floor, complete FROM streams WHERE board = ?", (board,)).fetchone()
+        if row is None:
+            return [], 1
+
+        depth, floor, complete = row[0], json.loads(row[1]), bool(row[2])
+        if floor is None and not complete:
+            return [], depth + 1
+
+        conditions = ["board = ?"]
+        params = [board]
+        if before is not None:
+            conditions.append("(COALESCE(write_date, ''), COALESCE(num, -1), article_url) < (?, ?, ?)")
+            params.extend(before)
+        if not complete:
+            conditions.append("(COALESCE(write_date, ''), COALESCE(num, -1), article_url) >= (?, ?, ?)")
+            params.extend(floor)
+
+        rows = connection.execute(
+            f"SELECT post FROM posts WHERE {' AND '.join(conditions)} "
+            f"ORDER BY COALESCE(write_date, '') DESC, COALESCE(num, -1) DESC, article_url DESC LIMIT ?",
+            params + [limit]).fetchall()
+
+        return [json.loads(post) for post, in rows], None if complete else depth + 1
+
+    def store_article(self, url: str, article: dict):
+        try:
+            self._store_article(url, article)
+        except sqlite3.Error:
+            logger.warning("Storing article %s failed", url, exc_info=True)
+
+    def _store_article(self, url: str, article: dict):
+        connection = self._connect()
+        data = json.dumps(article, ensure_ascii=False)
+        previous = connection.execute("SELECT article FROM articles WHERE url = ?", (url,)).fetchone()
+
+        connection.execute("INSERT OR REPLACE INTO articles (url, article, stored_at) VALUES (?, ?, ?)",
+                           (url, data, time.time()))
+        if self.searchable and (previous is None or previous[0] != data):
+            connection.execute(
+                "UPDATE search_index SET body = ? WHERE rowid IN (SELECT rowid FROM posts WHERE url = ?)",
+                (plain_text(article.get('text')), url))
+
+    def search(self, query: str, boards: list = None, limit: int = 20, offset: int = 0):
+        # Terms of three or more characters go through the index, shorter ones are matched with LIKE.
+        # None when this SQLite has no search index
+        connection = self._connect()
+        if not self.searchable:
+            return None
+
+        conditions = []
+        params = []
+
+        long_terms = [term for term in query.split() if len(term) >= 3]
+        if long_terms:
+            conditions.append("search_index MATCH ?")
+            params.append(' AND '.join('"' + term.replace('"', '""') + '"' for term in long_terms))
+
+        for term in [term for term in query.split() if len(term) < 3]:
+            conditions.append("(search_index.title LIKE ? ESCAPE '\\' OR search_index.writer LIKE ? ESCAPE '\\' "
+                              "OR search_index.body LIKE ? ESCAPE '\\')")
+            params.extend([like_pattern(term)] * 3)
+
+        if not conditions:
+            return 0, []
+
+        if boards is not None:
+            conditions.append(f"posts.board IN ({', '.join('?' * len(boards))})")
+            params.extend(boards)
+
+        where = ' AND '.join(conditions)
+        total = connection.execute(
+            f"SELECT COUNT(*) FROM search_index JOIN posts ON posts.rowid = search_index.rowid WHERE {where}",
+            params).fetchone()[0]
+        rows = connection.execute(
+            f"SELECT posts.board, posts.post FROM search_index JOIN posts ON posts.rowid = search_index.rowid "
+            f"WHERE {where} ORDER BY posts.write_date DESC, posts.num DESC LIMIT ? OFFSET ?",
+            params + [limit, offset]).fetchall()
+
+        return total, [(board, json.loads(post)) for board, post in rows]
+
+    def article(self, url: str, max_age_seconds: int):
+        row = self._connect().execute(
+            "SELECT article, stored_at FROM articles WHERE url = ? AND stored_at > ?",
+            (url, time.time() - max_age_seconds - config.POST_STORE_MAX_STALE_SECONDS)).fetchone()
+
+        if row is None:
+            return None
+
+        article, stored_at = row
+        age = time.time() - stored_at
+        return CacheEntry(json.loads(article), age, age >= max_age_seconds)
+
+    def stats(self):
+        connection = self._connect()
+        rows = connection.execute(
+            "SELECT board, COUNT(*), MAX(num), MAX(write_date), MAX(indexed_at) FROM posts "
+            "GROUP BY board ORDER BY board").fetchall()
+        pages = dict(connection.execute("SELECT board, COUNT(*) FROM pages GROUP BY board").fetchall())
+
+        return {
+            'articles': connection.execute("SELECT COUNT(*) FROM articles").fetchone()[0],
+            'boards': {board: {'posts': count, 'pages': pages.get(board, 0), 'highest_num': highest_num,
+                               'newest_write_date': write_date, 'last_indexed_at': indexed_at}
+                       for board, count, highest_num, write_date, indexed_at in rows},
+        }
+
+
+store = PostStore()
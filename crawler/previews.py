@@ -0,0 +1,40 @@
+import asyncio
+
+import config
+from crawler import article_cache, batch, singleflight
+from crawler.article_format import summary
+
+
+def preview(article):
+    if not isinstance(article, dict) or article.get('status_code') != 200:
+        return None
+
+    return summary(article.get('text'), config.PREVIEW_CHARS)
+
+
+async def with_previews(posts: list):
+    # Articles that are cached already are previewed right away, the rest are fetched concurrently
+    previews = {}
+    missing = []
+    for post in posts:
+        url = post['article_url']
+        article = article_cache.peek(url)
+        if article is not None:
+            previews[url] = preview(article)
+        elif url not in missing:
+            missing.append(url)
+
+    tasks = {url: asyncio.ensure_future(batch.fetch_article(url)) for url in missing}
+    if tasks:
+        done, pending = await asyncio.wait(tasks.values(), timeout=config.PREVIEW_BUDGET_SECONDS)
+
+        # Articles not ready within the budget keep loading into the cache for the next request
+        for task in pending:
+            task.add_done_callback(singleflight.log_background_error)
+
+        for url, task in tasks.items():
+            if task in done and task.exception() is None:
+                previews[url] = preview(task.result())
+
+    complete = all(post['article_url'] in previews for post in posts)
+    return [{**post, 'preview': previews.get(post['article_url'])} for post in posts], complete
@@ -0,0 +1,107 @@
+import re
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+import config
+
+# name: legacy wrapper name, site/path: route /v2/{site}/{path}/, kind: crawler that serves the board,
+# params: board identifiers passed to the crawler (including page_merge for merged boards).
+# Selectors are not part of a board: every board of a kind shares its site's markup, and the parse functions of
+# that kind's crawler carry them along with the per-site handling they need (headline rows, optional columns)
+Board = namedtuple('Board', ['name', 'site', 'path', 'kind', 'params', 'max_age_seconds'],
+                   defaults=[config.BOARD_MAX_AGE_SECONDS])
+
+hosts = {
+    'cse': 'cse.koreatech.ac.kr',
+    'school': 'www.koreatech.ac.kr',
+    'dorm': 'dorm.koreatech.ac.kr',
+    'department': 'cms3.koreatech.ac.kr',
+}
+
+boards = [
+    Board('cse_notice', 'cse', 'notice', 'cse', {'board': 'notice'}),
+    Board('cse_job_board', 'cse', 'job', 'cse', {'board': 'jobboard'}),
+    Board('cse_free_board', 'cse', 'free', 'cse', {'board': 'freeboard'}),
+    Board('cse_pds', 'cse', 'pds', 'cse', {'board': 'pds'}),
+
+    Board('school_general_notice', 'school', 'notice', 'school', {'board': 'list', 'm_code': 'MN230'}),
+    Board('school_scholar_notice', 'school', 'scholar', 'school', {'board': 'scholarList', 'm_code': 'MN231'}),
+    Board('school_bachelor_notice', 'school', 'bachelor', 'school', {'board': 'bachelorList', 'm_code': 'MN233'}),
+    Board('school_covid19_notice', 'school', 'covid19', 'school', {'board': 'boardList8', 'm_code': 'MN427'}),
+
+    Board('dorm_notice', 'dorm', 'notice', 'dorm', {'board': 'notice', 'page_merge': 2}),
+    Board('dorm_free_board', 'dorm', 'free', 'dorm', {'board': 'bulletin', 'page_merge': 2}),
+
+    Board('mechanical_notice', 'mechanical', 'notice', 'department',
+          {'department': 'me', 'board_num': 229, 'page_merge': 2}),
+    Board('mechanical_lecture_notice', 'mechanical', 'lecture', 'department',
+          {'department': 'me', 'board_num': 230, 'page_merge': 2}),
+    Board('mechanical_free_board', 'mechanical', 'free', 'department',
+          {'department': 'me', 'board_num': 232, 'page_merge': 2}),
+
+    Board('mechatronics_notice', 'mechatronics', 'notice', 'department',
+          {'department': 'mechatronics', 'board_num': 235, 'page_merge': 2}),
+    Board('mechatronics_lecture_notice', 'mechatronics', 'lecture', 'department',
+          {'department': 'mechatronics', 'board_num': 236, 'page_merge': 2}),
+    Board('mechatronics_bachelor_notice', 'mechatronics', 'bachelor', 'department',
+          {'department': 'mechatronics', 'board_num': 237, 'page_merge': 2}),
+    Board('mechatronics_job_notice', 'mechatronics', 'job', 'department',
+          {'department': 'mechatronics', 'board_num': 238, 'page_merge': 2}),
+    Board('mechatronics_free_board', 'mechatronics', 'free', 'department',
+          {'department': 'mechatronics', 'board_num': 244, 'page_merge': 2}),
+
+    Board('ite_notice', 'ite', 'notice', 'department', {'department': 'ite', 'board_num': 247, 'page_merge': 2}),
+
+    Board('ide_notice', 'ide', 'notice', 'department', {'department': 'ide', 'board_num': 330, 'page_merge': 2}),
+    Board('ide_free_board', 'ide', 'free', 'department', {'department': 'ide', 'board_num': 332, 'page_merge': 2}),
+
+    Board('arch_notice', 'arch', 'notice', 'department', {'department': 'arch', 'board_num': 340, 'page_merge': 2}),
+    Board('arch_free_board', 'arch', 'free', 'department', {'department': 'arch', 'board_num': 341, 'page_merge': 2}),
+
+    Board('emc_notice', 'emc', 'notice', 'department', {'department': 'emc', 'board_num': 541, 'page_merge': 2}),
+
+    Board('sim_notice', 'sim', 'notice', 'department', {'department': 'sim', 'board_num': 373, 'page_merge': 2}),
+]
+
+
+def find(name: str):
+    for board in boards:
+        if board.name == name:
+            return board
+
+    return None
+
+
+def boards_of_site(site: str):
+    return [board for board in boards if board.site == site]
+
+
+def boards_of_kind(kind: str):
+    return [board for board in boards if board.kind == kind]
+
+
+def sites():
+    # Site name to the crawler kind serving it, in registry order
+    result = {}
+    for board in boards:
+        result.setdefault(board.site, board.kind)
+
+    return result
+
+
+def host(board: Board):
+    return hosts[board.kind]
+
+
+def board_cache_size(kind: str):
+    return len(boards_of_kind(kind)) * config.BOARD_CACHE_PAGES
+
+
+def kind_of_url(url: str):
+    # School article links drop the www of its list pages
+    netloc = re.sub(r'^www\.', '', urlsplit(url.strip()).netloc.lower())
+    for kind, kind_host in hosts.items():
+        if netloc == re.sub(r'^www\.', '', kind_host):
+            return kind
+
+    return None
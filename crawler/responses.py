@@ -0,0 +1,229 @@
+import gzip
+import hashlib
+import json
+import logging
+import re
+from collections import namedtuple
+
+from fastapi import Request, Response
+from starlette.datastructures import MutableHeaders
+
+import config
+from crawler import registry
+from crawler.cache import MemoryCache, caches
+from crawler.urls import normalize_url
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# JSON body of a response, its precompressed variants by content coding and the ETag of the body
+Encoded = namedtuple('Encoded', ['body', 'variants', 'etag'])
+
+# An encoded response, how old its content is and how long that content stays fresh in the crawler caches
+Prepared = namedtuple('Prepared', ['encoded', 'age', 'max_age'])
+
+
+class ResponseCache(MemoryCache):
+    # Values are Prepared responses, measured by their bytes
+    def measure(self, value):
+        encoded = value.encoded
+        return len(encoded.body) + sum(len(variant) for variant in encoded.variants.values())
+
+
+# Ready-to-send list pages and articles, they only hold bytes so they stay in this worker's memory
+# whatever CACHE_BACKEND is
+response_cache = ResponseCache('response',
+                               max_len=len(registry.boards) * config.BOARD_CACHE_PAGES + config.ARTICLE_CACHE_MAX_LEN,
+                               max_age_seconds=config.BOARD_MAX_AGE_SECONDS,
+                               max_bytes=config.RESPONSE_CACHE_MAX_BYTES)
+caches.append(response_cache)
+
+# Preferred first when a client accepts several
+codings = ['br', 'gzip']
+
+# br needs the Brotli package, without it responses are only gzipped
+enabled_codings = [coding for coding in config.RESPONSE_COMPRESS if coding != 'br' or brotli is not None]
+if len(enabled_codings) < len(config.RESPONSE_COMPRESS):
+    logger.warning("Brotli is not installed, responses are not compressed with br")
+
+
+def compress(body: bytes, coding: str):
+    if coding == 'br':
+        return brotli.compress(body)
+
+    return gzip.compress(body)
+
+
+def encode(content):
+    # Same separators as FastAPI's JSONResponse
+    body = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode()
+
+    variants = {}
+    if len(body) >= config.RESPONSE_COMPRESS_MIN_BYTES:
+        variants = {coding: compress(body, coding) for coding in enabled_codings}
+
+    return Encoded(body, variants, hashlib.sha1(body).hexdigest())
+
+
+def accepted_codings(request: Request):
+    accepted = set()
+    for item in request.headers.get('accept-encoding', '').split(','):
+        coding, _, params = item.partition(';')
+        # Codings with q=0 are refused
+        quality = re.search(r'q=(\d+(?:\.\d*)?)', params)
+        if quality is None or float(quality.group(1)) > 0:
+            accepted.add(coding.strip().lower())
+
+    return accepted
+
+
+def preferred_coding(request: Request, available):
+    accepted = accepted_codings(request)
+    return next((coding for coding in codings if coding in available and coding in accepted), None)
+
+
+def matches(request: Request, etag: str):
+    # Every coding of the same body answers to the body's ETag
+    for item in request.headers.get('if-none-match', '').split(','):
+        item = item.strip()
+        if item == '*' or re.sub(r'^W/', '', item).strip('"').split('-')[0] == etag:
+            return True
+
+    return False
+
+
+def send(prepared: Prepared, request: Request):
+    encoded = prepared.encoded
+    body, coding = encoded.body, None
+    if encoded.variants:
+        coding = preferred_coding(request, encoded.variants)
+        if coding is not None:
+            body = encoded.variants[coding]
+
+    # A strong ETag differs between codings of the same body. Clients and proxies subtract Age from max-age
+    # themselves, so max-age is the whole lifetime of the content
+    headers = {
+        'ETag': f'"{encoded.etag}-{coding}"' if coding is not None else f'"{encoded.etag}"',
+        'Cache-Control': f'public, max-age={prepared.max_age}',
+        'Age': str(prepared.age),
+    }
+    if encoded.variants:
+        headers['Vary'] = 'Accept-Encoding'
+
+    # Clients that already have this body get a 304 without it being sent again
+    if matches(request, encoded.etag):
+        return Response(status_code=304, headers=headers)
+
+    if coding is not None:
+        headers['Content-Encoding'] = coding
+
+    return Response(body, media_type='application/json', headers=headers)
+
+
+def cached(key: str):
+    # A response served earlier in this worker whose content is still fresh
+    entry = response_cache.get_entry(key)
+    if entry is None or entry.stale:
+        return None
+
+    prepared = entry.value
+    return prepared._replace(age=int(prepared.age + entry.age))
+
+
+def prepare(key: str, content, age: int, max_age: int, cacheable: bool):
+    prepared = Prepared(encode(content), int(age), max_age)
+
+    # Only fresh content is kept, for what is left of its max age in the crawler caches
+    if cacheable and prepared.age < max_age:
+        response_cache.set(key, prepared, max_age - prepared.age)
+    else:
+        prepared = prepared._replace(max_age=0)
+
+    return prepared
+
+
+def page_key(board: registry.Board, page: int, view: str = ''):
+    return f'page_{board.name}_{page}_{view}'
+
+
+def article_key(kind: str, url: str, view: str):
+    # The same URL asked through another site's route is parsed by another crawler
+    return f'article_{kind}_{view}_{normalize_url(url)}'
+
+
+def cached_page(board: registry.Board, page: int, view: str = ''):
+    return cached(page_key(board, page, view))
+
+
+def prepare_page(board: registry.Board, page: int, result: dict, max_age_seconds: int, view: str = '',
+                 cacheable: bool = True):
+    # Age and staleness change on every request, they are sent in headers instead of the body
+    content = {key: value for key, value in result.items() if key not in ('age', 'stale')}
+    cacheable = cacheable and result.get('status_code') == 200 and 'age' in result and not result['stale']
+
+    return prepare(page_key(board, page, view), content, result.get('age', 0), max_age_seconds, cacheable)
+
+
+def forget_page(board: registry.Board, page: int):
+    for view in ('', 'preview'):
+        response_cache.delete(page_key(board, page, view))
+
+
+def cached_article(kind: str, url: str, view: str):
+    # view tells the format and fields the article was shaped with
+    return cached(article_key(kind, url, view))
+
+
+def prepare_article(kind: str, url: str, view: str, article, age: int):
+    # age is None when the article was not served from a fresh cache entry
+    cacheable = age is not None and isinstance(article, dict) and article.get('status_code') == 200
+
+    return prepare(article_key(kind, url, view), article, age or 0, config.ARTICLE_CACHE_MAX_AGE_SECONDS,
+                   cacheable)
+
+
+class CompressionMiddleware:
+    # Compresses the large responses that were not sent precompressed, e.g. feeds, search results and batches
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        coding = preferred_coding(Request(scope), enabled_codings) if scope['type'] == 'http' else None
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        chunks = []
+
+        async def send_compressed(message):
+            nonlocal start
+
+            if message['type'] == 'http.response.start':
+                start = message
+                return
+            if message['type'] != 'http.response.body':
+                await send(message)
+                return
+
+            # The API has no streaming responses, bodies are buffered whole
+            chunks.append(message.get('body', b''))
+            if message.get('more_body', False):
+                return
+
+            body = b''.join(chunks)
+            headers = MutableHeaders(raw=start['headers'])
+            if len(body) >= config.RESPONSE_COMPRESS_MIN_BYTES and 'content-encoding' not in headers:
+                body = compress(body, coding)
+                headers['Content-Encoding'] = coding
+                headers['Content-Length'] = str(len(body))
+                headers.add_vary_header('Accept-Encoding')
+
+            await send(start)
+            await send({'type': 'http.response.body', 'body': body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,34 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# In-flight crawls of this worker, keyed like the board cache entries they will fill
+calls = {}
+
+
+async def do(key: str, func, *args):
+    task = calls.get(key)
+
+    if task is None:
+        task = asyncio.ensure_future(func(*args))
+        calls[key] = task
+        task.add_done_callback(lambda _: calls.pop(key, None))
+
+    # A cancelled waiter must not cancel the crawl the other waiters are sharing
+    return await asyncio.shield(task)
+
+
+def do_in_background(key: str, func, *args):
+    if key in calls:
+        return
+
+    task = asyncio.ensure_future(func(*args))
+    calls[key] = task
+    task.add_done_callback(lambda _: calls.pop(key, None))
+    task.add_done_callback(log_background_error)
+
+
+def log_background_error(task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background crawl failed", exc_info=task.exception())
@@ -0,0 +1,35 @@
+from fastapi.encoders import jsonable_encoder
+
+from crawler.v2 import crawlers
+
+# Legacy responses are cut from the cached v2 crawl, only their shape differs
+
+
+def board_response(result: dict):
+    if result.get('status_code') != 200:
+        return jsonable_encoder({'status_code': result.get('status_code')})
+
+    # Past the last page v1 clients expect the end marker instead of an empty list
+    if not result['posts']:
+        return jsonable_encoder([{"status": "END"}])
+
+    return result['posts']
+
+
+def article_response(result):
+    # v2 answers articles it cannot parse with a list
+    if isinstance(result, list):
+        return jsonable_encoder([{"status": "END"}])
+
+    if result.get('status_code') != 200:
+        return jsonable_encoder({'status_code': result.get('status_code')})
+
+    return [{key: value for key, value in result.items() if key != 'status_code'}]
+
+
+async def crawl_board(board, page: int):
+    return board_response(await crawlers.crawl_board(board, page))
+
+
+async def crawl_article(kind: str, url: str):
+    return article_response(await crawlers.crawl_article(kind, url))
@@ -0,0 +1,105 @@
+from fastapi.encoders import jsonable_encoder
+
+import config
+from crawler import adaptive_ttl, board_meta, registry, responses, singleflight
+from crawler.cache import create_cache
+from crawler.post_store import store
+from crawler.v2.cse_crawler import fetch_cse_board, cse_article_parser
+from crawler.v2.department_common_crawler import fetch_department_board, department_common_article_parser
+from crawler.v2.dorm_crawler import fetch_dorm_board, dorm_article_parser
+from crawler.v2.school_crawler import fetch_school_board, school_article_parser
+
+# Fetches one API page of a board kind of crawler/registry.py upstream, returns (status_code, last_page, posts).
+# posts is None when the page could not be parsed
+board_fetchers = {
+    'cse': fetch_cse_board,
+    'school': fetch_school_board,
+    'dorm': fetch_dorm_board,
+    'department': fetch_department_board,
+}
+
+article_parsers = {
+    'cse': cse_article_parser,
+    'school': school_article_parser,
+    'dorm': dorm_article_parser,
+    'department': department_common_article_parser,
+}
+
+# Key a board is known by in the caches, board metadata, adaptive TTL and post store, without the page
+board_keys = {
+    'cse': lambda params: f"cse_{params['board']}",
+    'school': lambda params: f"school_{params['board']}",
+    'dorm': lambda params: f"dorm_{params['board']}",
+    'department': lambda params: f"{params['department']}_{params['board_num']}",
+}
+
+# Caching board data for BOARD_MAX_AGE_SECONDS unless the board sets its own
+board_caches = {kind: create_cache(f'{kind}_board', max_len=registry.board_cache_size(kind),
+                                   max_age_seconds=config.BOARD_MAX_AGE_SECONDS)
+                for kind in board_fetchers}
+
+
+def board_key(board):
+    return board_keys[board.kind](board.params)
+
+
+def empty_page():
+    return {'status_code': 200, 'last_page': -1, 'posts': []}
+
+
+async def crawl_board_page(board, key: str, page: int):
+    status_code, last_page, posts = await board_fetchers[board.kind](
+        **board.params, page=page, with_last_page=board_meta.needs_last_page(key))
+
+    if status_code != 200:
+        return jsonable_encoder({'status_code': status_code})
+    if posts is None:
+        return empty_page()
+
+    last_page = board_meta.update(key, page, posts, last_page)
+    if last_page is None:
+        return empty_page()
+
+    max_age_seconds = adaptive_ttl.max_age(key, page, posts, board.max_age_seconds)
+    board_caches[board.kind].set(f'{key}_{page}', posts, max_age_seconds)
+    store.store_page(key, page, posts, last_page)
+
+    return jsonable_encoder({'status_code': 200, 'last_page': last_page, 'posts': posts, 'age': 0, 'stale': False})
+
+
+async def serve_board_page(board, page: int, refresh: bool = False):
+    key = board_key(board)
+
+    last_page = board_meta.last_page(key)
+    if last_page is not None and last_page < page:
+        return empty_page()
+
+    entry = board_caches[board.kind].get_entry(f'{key}_{page}')
+    if not refresh and (entry is None or last_page is None):
+        # Pages persisted by an earlier crawl are served while they are refreshed, even after a restart
+        stored = store.page(key, page, adaptive_ttl.current(key, board.max_age_seconds))
+        if stored is not None:
+            entry, last_page = stored
+
+    if refresh or entry is None or last_page is None:
+        return await singleflight.do(f'{key}_{page}', crawl_board_page, board, key, page)
+
+    # Serve stale entries right away and refresh them in the background
+    if entry.stale:
+        singleflight.do_in_background(f'{key}_{page}', crawl_board_page, board, key, page)
+
+    # Cached posts are already JSON values
+    return {'status_code': 200, 'last_page': last_page, 'posts': entry.value,
+            'age': int(entry.age), 'stale': entry.stale}
+
+
+async def crawl_board(board, page: int, refresh: bool = False):
+    # A refreshed page must not be answered from the pre-serialized copy of the old one
+    if refresh:
+        responses.forget_page(board, page)
+
+    return await serve_board_page(board, page, refresh)
+
+
+async def crawl_article(kind: str, url: str):
+    return await article_parsers[kind](url)
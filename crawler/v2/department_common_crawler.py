@@ -1,194 +1,124 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+from crawler import html_parser
 from fastapi.encoders import jsonable_encoder
 import re
-import math
-from expiringdict import ExpiringDict
+from crawler.article_cache import get_article
+from crawler.fetch import fetch_parsed, merge_pages
 
-board_cache = ExpiringDict(max_len=100, max_age_seconds=300)  # Caching board data for 5min
-last_page_cache = ExpiringDict(max_len=15, max_age_seconds=86400)  # Caching last_page data for 1day
+# Part of a list page that is fingerprinted to detect unchanged pages, view counts are ignored
+board_region = ('artclTable', '</table>', '_artclTdAccess')
 
 
-async def department_common_article_parser(url: str):
-    response = requests.get(url, verify=False)
-
-    if response.status_code == 200:
-        html = response.text
-        soup = BeautifulSoup(html, 'html.parser')
-        try:
-            title = soup.select_one(
-                "h2.artclViewTitle").get_text().strip().replace("［", "[").replace("］", "]")
-            writer = soup.select_one(
-                "body > div > div.artclViewHead > div.right > dl:nth-child(3) > dd").get_text().strip()
-            text = soup.select_one(
-                "div.artclView").decode_contents()
-            date = soup.select_one(
-                "body > div > div.artclViewHead > div.right > dl:nth-child(1) > dd").get_text().strip()
-
-        except AttributeError:
-            return jsonable_encoder([{"status_code": 404}])
+def parse_department_article(html: str):
+    soup = html_parser.parse(html)
+    try:
+        title = soup.select_one(
+            "h2.artclViewTitle").get_text().strip().replace("［", "[").replace("］", "]")
+        writer = soup.select_one(
+            "body > div > div.artclViewHead > div.right > dl:nth-child(3) > dd").get_text().strip()
+        text = soup.select_one(
+            "div.artclView").decode_contents()
+        date = soup.select_one(
+            "body > div > div.artclViewHead > div.right > dl:nth-child(1) > dd").get_text().strip()
 
-        text = text.replace("<img", "<br><img")
+    except AttributeError:
+        return None
 
-        files = soup.select("div.artclItem.viewForm > dl > dd > ul > li")
+    text = text.replace("<img", "<br><img")
 
-        file_list = []
-        for file in files:
-            file_uri = file.select_one("a")["href"]
-            file_name = file.select_one("a").get_text()
-            file_name = re.sub("\[.*]", "", file_name).strip()
-
-            file_dic = {
-                "file_uri": file_uri,
-                "file_name": file_name
-            }
+    files = soup.select("div.artclItem.viewForm > dl > dd > ul > li")
 
-            file_list.append(file_dic)
+    file_list = []
+    for file in files:
+        file_uri = file.select_one("a")["href"]
+        file_name = file.select_one("a").get_text()
+        file_name = re.sub("\[.*]", "", file_name).strip()
 
-        data_dic = {
-            'status_code': response.status_code,
-            'title': title,
-            'writer': writer,
-            'text': text,
-            'date': date,
-            'files': file_list
+        file_dic = {
+            "file_uri": file_uri,
+            "file_name": file_name
         }
 
-        return jsonable_encoder(data_dic)
-    else:
-        return jsonable_encoder({'status_code': response.status_code})
-
-
-async def department_common_parser(department: str, board_num: int, page: int, is_second_page: bool = False):
-    if not is_second_page:
-        page = page * 2 - 1
-
-    if board_cache.get(f'{department}_{board_num}_{page}') is None or \
-            last_page_cache.get(f'{department}_{board_num}') is None:
-
-        url = f"https://cms3.koreatech.ac.kr/bbs/{department}/{board_num}/artclList.do?page={page}"
-
-        response = requests.get(url, verify=False)
-
-        if response.status_code == 200:
-            data_list = []
-            html = response.text
-            soup = BeautifulSoup(html, 'html.parser')
-
-            if not is_second_page:
-                if last_page_cache.get(f'{department}_{board_num}') is not None:
-                    if last_page_cache.get(f'{department}_{board_num}') < page:
-                        return jsonable_encoder({'status_code': response.status_code, 'last_page': -1, 'posts': []})
-                    else:
-                        last_page = last_page_cache.get(f'{department}_{board_num}')
-                else:
-                    try:
-                        last_page = soup.select_one("a._last").get('href')
-                        last_page = re.search("(?<=javascript:page_link\(')\d*", last_page).group(0)
-                        last_page = int(last_page)
-                        last_page = math.ceil(last_page / 2)
-                    except AttributeError:
-                        return jsonable_encoder({'status_code': response.status_code, 'last_page': -1, 'posts': []})
-
-            posts = soup.select("table.artclTable > tbody > tr")
-            for post in posts:
-                try:
-                    if is_second_page and post.has_attr('class') and 'headline' in post['class']:
-                        continue
-
-                    num = post.select_one("td._artclTdNum").get_text().strip()
-                    title = post.select_one("td._artclTdTitle > a").get_text().strip().replace("\n", "") \
-                        .replace("\t", "").replace("［", "[").replace("］", "]")
-                    writer = post.select_one("td._artclTdWriter").get_text().strip()
-                    write_date = post.select_one("td._artclTdRdate").get_text().strip()
-                    read = post.select_one("td._artclTdAccess").get_text().strip()
-                    article_url = post.select_one("td._artclTdTitle > a").get('href')
-
-                    data_dic = {
-                        'num': num,
-                        'title': title,
-                        'writer': writer,
-                        'write_date': write_date,
-                        'read': read,
-                        'article_url': f"https://cms3.koreatech.ac.kr{article_url}"
-                    }
-                    data_list.append(data_dic)
-                except AttributeError:
-                    return jsonable_encoder({'status_code': response.status_code, 'last_page': -1, 'posts': []})
-
-            if page % 2 == 1:
-                data_list.extend(await department_common_parser(department, board_num, page + 1, True))
-
-            if is_second_page:
-                return data_list
-            else:
-                board_cache[f'{department}_{board_num}_{page}'] = data_list
-                if last_page_cache.get(f'{department}_{board_num}') is None:
-                    last_page_cache[f'{department}_{board_num}'] = last_page
-
-                return jsonable_encoder({'status_code': response.status_code, 'last_page': last_page, 'posts': data_list})
-        else:
-            return jsonable_encoder({'status_code': response.status_code})
-    else:
-        return jsonable_encoder({'status_code': 200, 'last_page': last_page_cache.get(f'{department}_{board_num}'),
-                                 'posts': board_cache.get(f'{department}_{board_num}_{page}')})
-
-
-async def mechanical_notice(page: int = 1):
-    return await department_common_parser("me", 229, page)
-
-
-async def mechanical_lecture_notice(page: int = 1):
-    return await department_common_parser("me", 230, page)
-
-
-async def mechanical_free_board(page: int = 1):
-    return await department_common_parser("me", 232, page)
+        file_list.append(file_dic)
 
+    return {
+        'title': title,
+        'writer': writer,
+        'text': text,
+        'date': date,
+        'files': file_list
+    }
 
-async def mechatronics_notice(page: int = 1):
-    return await department_common_parser("mechatronics", 235, page)
 
+async def _crawl_department_article(url: str):
+    status_code, article = await fetch_parsed(url, parse_department_article)
 
-async def mechatronics_lecture_notice(page: int = 1):
-    return await department_common_parser("mechatronics", 236, page)
-
-
-async def mechatronics_bachelor_notice(page: int = 1):
-    return await department_common_parser("mechatronics", 237, page)
-
-
-async def mechatronics_job_notice(page: int = 1):
-    return await department_common_parser("mechatronics", 238, page)
-
-
-async def mechatronics_free_board(page: int = 1):
-    return await department_common_parser("mechatronics", 244, page)
-
-
-async def ite_notice(page: int = 1):
-    return await department_common_parser("ite", 247, page)
+    if status_code == 200:
+        if article is None:
+            return jsonable_encoder([{"status_code": 404}])
 
+        return jsonable_encoder({'status_code': status_code, **article})
+    else:
+        return jsonable_encoder({'status_code': status_code})
 
-async def ide_notice(page: int = 1):
-    return await department_common_parser("ide", 330, page)
 
+async def department_common_article_parser(url: str):
+    return await get_article(url, _crawl_department_article)
 
-async def ide_free_board(page: int = 1):
-    return await department_common_parser("ide", 332, page)
 
+def parse_department_board(html: str, skip_headline: bool, with_last_page: bool = True):
+    soup = html_parser.parse(html)
 
-async def arch_notice(page: int = 1):
-    return await department_common_parser("arch", 340, page)
+    last_page = None
+    if with_last_page:
+        try:
+            last_page = soup.select_one("a._last").get('href')
+            last_page = re.search("(?<=javascript:page_link\(')\d*", last_page).group(0)
+            last_page = int(last_page)
+        except AttributeError:
+            last_page = None
 
+    data_list = []
+    posts = soup.select("table.artclTable > tbody > tr")
+    for post in posts:
+        try:
+            # Headline posts are repeated on every upstream page
+            if skip_headline and post.has_attr('class') and 'headline' in post['class']:
+                continue
+
+            num = post.select_one("td._artclTdNum").get_text().strip()
+            title = post.select_one("td._artclTdTitle > a").get_text().strip().replace("\n", "") \
+                .replace("\t", "").replace("［", "[").replace("］", "]")
+            writer = post.select_one("td._artclTdWriter").get_text().strip()
+            write_date = post.select_one("td._artclTdRdate").get_text().strip()
+            read = post.select_one("td._artclTdAccess").get_text().strip()
+            article_url = post.select_one("td._artclTdTitle > a").get('href')
+
+            data_dic = {
+                'num': num,
+                'title': title,
+                'writer': writer,
+                'write_date': write_date,
+                'read': read,
+                'article_url': f"https://cms3.koreatech.ac.kr{article_url}"
+            }
+            data_list.append(data_dic)
+        except AttributeError:
+            return last_page, None
 
-async def arch_free_board(page: int = 1):
-    return await department_common_parser("arch", 341, page)
+    return last_page, data_list
 
 
-async def emc_notice(page: int = 1):
-    return await department_common_parser("emc", 541, page)
+async def fetch_department_board(department: str, board_num: int, page: int, with_last_page: bool,
+                                 page_merge: int = 2):
+    # One API page is made of page_merge upstream pages
+    first_page = (page - 1) * page_merge + 1
+    urls = [f"https://cms3.koreatech.ac.kr/bbs/{department}/{board_num}/artclList.do?page={upstream_page}"
+            for upstream_page in range(first_page, first_page + page_merge)]
 
+    # Only the first upstream page is asked for the pagination, headline posts are only kept from it
+    fetched = await asyncio.gather(*[fetch_parsed(url, parse_department_board, index > 0,
+                                                  with_last_page and index == 0, region=board_region)
+                                     for index, url in enumerate(urls)])
 
-async def sim_notice(page: int = 1):
-    return await department_common_parser("sim", 373, page)
+    return merge_pages(fetched, page_merge)
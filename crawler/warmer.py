@@ -0,0 +1,125 @@
+import asyncio
+import fcntl
+import logging
+import random
+import time
+
+import config
+from crawler import adaptive_ttl, incremental, registry
+from crawler.board_meta import SQLiteMetaStore
+from crawler.v2.crawlers import board_key
+
+logger = logging.getLogger(__name__)
+
+# Only the worker holding the lock warms, the status goes in the post store's SQLite file whatever CACHE_BACKEND is
+# so every worker can report it
+status_store = SQLiteMetaStore(config.POST_STORE_PATH, 'warmer_status')
+
+task = None
+lock_file = None
+
+
+def acquire_lock():
+    global lock_file
+
+    lock_file = open(config.WARMER_LOCK_PATH, 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        lock_file = None
+        return False
+
+    return True
+
+
+async def warm_board(board: registry.Board):
+    started_at = time.time()
+    board_status = {'last_run': started_at, 'duration': None, 'pages': 0, 'new_posts': 0, 'error': None}
+
+    try:
+        board_status.update(await incremental.crawl_new_posts(board))
+    except Exception as e:
+        logger.warning("Warming %s failed", board.name, exc_info=True)
+        board_status['error'] = repr(e)
+
+    board_status['duration'] = time.time() - started_at
+    status_store.set(board.name, board_status)
+
+
+def is_due(board: registry.Board):
+    board_status = status_store.get(board.name)
+    if board_status is None:
+        return True
+
+    # Boards that rarely change get a long TTL and are re-crawled just before it runs out
+    ttl = adaptive_ttl.current(board_key(board), board.max_age_seconds)
+    return time.time() - board_status['last_run'] + config.WARMER_INTERVAL_SECONDS >= ttl
+
+
+async def warm_host(host_boards: list):
+    for board in host_boards:
+        if not is_due(board):
+            continue
+
+        await warm_board(board)
+        await asyncio.sleep(config.WARMER_HOST_DELAY_SECONDS + random.uniform(0, config.WARMER_JITTER_SECONDS))
+
+
+async def run():
+    hosts = {}
+    for board in registry.boards:
+        hosts.setdefault(registry.host(board), []).append(board)
+
+    while True:
+        started_at = time.time()
+        # Hosts are warmed in parallel, boards of the same host one after another
+        await asyncio.gather(*[warm_host(host_boards) for host_boards in hosts.values()])
+        status_store.set('_cycle', {'last_run': started_at, 'duration': time.time() - started_at})
+
+        await asyncio.sleep(config.WARMER_INTERVAL_SECONDS + random.uniform(0, config.WARMER_JITTER_SECONDS))
+
+
+def start():
+    global task
+
+    if config.WARMER_ENABLED and task is None and acquire_lock():
+        task = asyncio.ensure_future(run())
+
+
+async def stop():
+    global task, lock_file
+
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        task = None
+
+    if lock_file is not None:
+        lock_file.close()
+        lock_file = None
+
+
+def status():
+    cycle = status_store.get('_cycle')
+
+    return {
+        'enabled': config.WARMER_ENABLED,
+        'running_in_this_worker': task is not None,
+        'schedule': {
+            'pages': config.WARMER_PAGES,
+            'interval_seconds': config.WARMER_INTERVAL_SECONDS,
+            'host_delay_seconds': config.WARMER_HOST_DELAY_SECONDS,
+            'jitter_seconds': config.WARMER_JITTER_SECONDS,
+        },
+        'last_cycle': cycle,
+        'boards': [
+            {'name': board.name, 'host': registry.host(board),
+             'ttl': adaptive_ttl.current(board_key(board), board.max_age_seconds),
+             **(status_store.get(board.name) or {'last_run': None})}
+            for board in registry.boards
+        ],
+    }
@@ -1,19 +1,31 @@
 from fastapi import FastAPI
 
+from crawler import http_client, parse_pool, responses, warmer
 from routers.v1 import api
-from routers.v2 import mechanical, arch, school, dorm, mechatronics, sim, cse, ite, ide, emc
+from routers.v2 import admin, articles, boards, feed, search
 
 app = FastAPI()
+app.add_middleware(responses.CompressionMiddleware)
 
-app.include_router(cse.router)
-app.include_router(arch.router)
-app.include_router(dorm.router)
-app.include_router(emc.router)
-app.include_router(ide.router)
-app.include_router(ite.router)
-app.include_router(mechanical.router)
-app.include_router(mechatronics.router)
-app.include_router(school.router)
-app.include_router(sim.router)
+for router in boards.routers:
+    app.include_router(router)
+app.include_router(articles.router)
+app.include_router(feed.router)
+app.include_router(search.router)
+app.include_router(admin.router)
 
 app.include_router(api.router)
+
+
+@app.on_event("startup")
+async def startup():
+    await http_client.start()
+    parse_pool.start()
+    warmer.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await warmer.stop()
+    parse_pool.stop()
+    await http_client.close()
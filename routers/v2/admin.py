@@ -0,0 +1,39 @@
+from fastapi import APIRouter
+from crawler import board_meta, cache, fetch, parse_pool, warmer
+from crawler.post_store import store
+
+router = APIRouter(
+    prefix="/v2/admin",
+    tags=["admin"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+@router.get("/warmer/")
+async def get_warmer_status():
+    return warmer.status()
+
+
+@router.get("/cache/")
+async def get_cache_stats():
+    return [backend.stats() for backend in cache.caches]
+
+
+@router.get("/parse_pool/")
+async def get_parse_pool_stats():
+    return parse_pool.stats()
+
+
+@router.get("/fetch/")
+async def get_fetch_stats():
+    return fetch.stats()
+
+
+@router.get("/boards/")
+async def get_board_meta():
+    return {key: meta for key, meta in board_meta.items()}
+
+
+@router.get("/store/")
+async def get_post_store_stats():
+    return store.stats()
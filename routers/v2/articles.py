@@ -0,0 +1,28 @@
+from typing import List
+
+from fastapi import APIRouter, Body
+from fastapi.encoders import jsonable_encoder
+
+import config
+from crawler import article_format, batch
+
+router = APIRouter(
+    prefix="/v2/articles",
+    tags=["articles"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+@router.post("/")
+async def get_articles(urls: List[str] = Body(..., embed=True), format: str = 'html', fields: str = None):
+    # urls may come from different sites, each item is answered with its own status_code
+    if len(urls) > config.BATCH_MAX_ARTICLES or format not in article_format.formats:
+        return jsonable_encoder({'status_code': 400})
+
+    articles = await batch.fetch_articles(urls)
+    fields = article_format.parse_fields(fields)
+    if fields is not None:
+        fields.append('url')
+
+    return jsonable_encoder({'status_code': 200,
+                             'articles': [article_format.shape(article, format, fields) for article in articles]})
@@ -0,0 +1,94 @@
+from fastapi import APIRouter, Request
+from fastapi.encoders import jsonable_encoder
+import config
+from crawler import adaptive_ttl, article_cache, article_format, cursor as list_cursor, feed, previews, registry, \
+    responses
+from crawler.v2.crawlers import board_key, crawl_board, crawl_article
+
+
+async def get_board_stream(board: registry.Board, cursor: str, limit: int, preview: bool):
+    # Cursors stay on the same post when new posts push everything down a page
+    after = None
+    if cursor is not None:
+        after = list_cursor.decode(cursor)
+        if after is None or after[1] != board.name:
+            return jsonable_encoder({'status_code': 400})
+
+    limit = min(max(limit or 20, 1), config.FEED_MAX_LIMIT)
+    posts, next_key, truncated = await feed.collect([board], after, limit)
+    posts = [post for board, post in posts]
+    if preview:
+        posts, _ = await previews.with_previews(posts)
+
+    return jsonable_encoder({'status_code': 200, 'posts': posts,
+                             'next_cursor': list_cursor.encode(next_key) if next_key is not None else None,
+                             'truncated': truncated})
+
+
+async def get_board_page(board: registry.Board, page: int, preview: bool, request: Request):
+    # Hot pages are answered with the bytes encoded the first time they were served
+    view = 'preview' if preview else ''
+    prepared = responses.cached_page(board, page, view)
+    if prepared is None:
+        result = await crawl_board(board, page)
+
+        # A page is only kept with its previews once every post has one
+        complete = True
+        if preview and result.get('posts'):
+            posts, complete = await previews.with_previews(result['posts'])
+            result = {**result, 'posts': posts}
+
+        prepared = responses.prepare_page(board, page, result,
+                                          adaptive_ttl.current(board_key(board), board.max_age_seconds),
+                                          view, complete)
+
+    return responses.send(prepared, request)
+
+
+def board_endpoint(board: registry.Board):
+    async def get_board(request: Request, page: int = 1, cursor: str = None, limit: int = None,
+                        preview: bool = False):
+        # Page numbers follow upstream, cursor and limit walk the board's post stream instead.
+        # preview=true adds a short text preview of each post's article
+        if cursor is not None or limit is not None:
+            return await get_board_stream(board, cursor, limit, preview)
+
+        return await get_board_page(board, page, preview, request)
+
+    return get_board
+
+
+def article_endpoint(kind: str):
+    async def get_article(request: Request, url: str, format: str = 'html', fields: str = None):
+        # format=stripped, text or summary slims the body down, fields=title,date,... keeps only those keys
+        if format not in article_format.formats:
+            return jsonable_encoder({'status_code': 400})
+
+        view = f'{format}_{fields or ""}'
+        prepared = responses.cached_article(kind, url, view)
+        if prepared is None:
+            article = article_format.shape(await crawl_article(kind, url), format, article_format.parse_fields(fields))
+            prepared = responses.prepare_article(kind, url, view, article, article_cache.fresh_age(url))
+
+        return responses.send(prepared, request)
+
+    return get_article
+
+
+def create_router(site: str, kind: str):
+    router = APIRouter(
+        prefix=f"/v2/{site}",
+        tags=[site],
+        responses={404: {"description": "Not found"}},
+    )
+
+    for board in registry.boards_of_site(site):
+        router.add_api_route(f"/{board.path}/", board_endpoint(board), methods=["GET"], name=f"get_{board.name}")
+
+    router.add_api_route("/article/", article_endpoint(kind), methods=["GET"], name=f"get_{site}_article")
+
+    return router
+
+
+# One router per site, generated from the board registry
+routers = [create_router(site, kind) for site, kind in registry.sites().items()]
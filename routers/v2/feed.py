@@ -0,0 +1,34 @@
+from fastapi import APIRouter
+from fastapi.encoders import jsonable_encoder
+
+import config
+from crawler import cursor as feed_cursor, feed, registry
+
+router = APIRouter(
+    prefix="/v2/feed",
+    tags=["feed"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+@router.get("/")
+async def get_feed(boards: str, cursor: str = None, limit: int = 20):
+    # boards is a comma separated list of registry board names, e.g. cse_notice,school_general_notice
+    names = dict.fromkeys(name.strip() for name in boards.split(',') if name.strip())
+    selected = [registry.find(name) for name in names]
+    if not selected or None in selected:
+        return jsonable_encoder({'status_code': 404})
+
+    after = None
+    if cursor is not None:
+        after = feed_cursor.decode(cursor)
+        if after is None:
+            return jsonable_encoder({'status_code': 400})
+
+    limit = min(max(limit, 1), config.FEED_MAX_LIMIT)
+    posts, next_key, truncated = await feed.collect(selected, after, limit)
+
+    return jsonable_encoder({'status_code': 200,
+                             'posts': [{'board': board.name, 'site': board.site, **post} for board, post in posts],
+                             'next_cursor': feed_cursor.encode(next_key) if next_key is not None else None,
+                             'truncated': truncated})
@@ -0,0 +1,41 @@
+import math
+
+from fastapi import APIRouter
+from fastapi.encoders import jsonable_encoder
+
+import config
+from crawler import registry
+from crawler.post_store import store
+from crawler.v2.crawlers import board_key
+
+router = APIRouter(
+    prefix="/v2/search",
+    tags=["search"],
+    responses={404: {"description": "Not found"}},
+)
+
+# Posts are stored under the crawler's board key, results are reported with the registry name
+boards_by_key = {board_key(board): board for board in registry.boards}
+
+
+@router.get("/")
+async def search(q: str, board: str = None, page: int = 1):
+    boards = None
+    if board is not None:
+        if registry.find(board) is None:
+            return jsonable_encoder({'status_code': 404})
+        boards = [board_key(registry.find(board))]
+
+    found = store.search(q, boards, config.SEARCH_PAGE_SIZE, (page - 1) * config.SEARCH_PAGE_SIZE)
+    if found is None:
+        return jsonable_encoder({'status_code': 503})
+
+    total, rows = found
+    last_page = math.ceil(total / config.SEARCH_PAGE_SIZE)
+    if page < 1 or page > last_page:
+        return jsonable_encoder({'status_code': 200, 'last_page': -1, 'posts': []})
+
+    posts = [{'board': boards_by_key[key].name, 'site': boards_by_key[key].site, **post}
+             for key, post in rows if key in boards_by_key]
+
+    return jsonable_encoder({'status_code': 200, 'last_page': last_page, 'posts': posts})
@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+
+import config
+from crawler import feed, registry
+from crawler.post_store import PostStore, stream_key
+
+per_page = 10
+
+
+class Upstream:
+    # A board numbered from 1 up to newest, newest first and with a headline post on every page, as upstream lists it
+    def __init__(self, newest: int):
+        self.newest = newest
+        self.down = False
+
+    def page(self, page: int):
+        nums = range(self.newest - (page - 1) * per_page, max(self.newest - page * per_page, 0), -1)
+        headline = {'num': '공지', 'title': 'headline', 'article_url': 'https://example.com/0',
+                    'write_date': '2019.01.01'}
+        return [headline] + [{'num': str(num), 'title': f'post {num}', 'article_url': f'https://example.com/{num}',
+                             'write_date': f'2022.{num // 28 % 12 + 1:02d}.{num % 28 + 1:02d}'} for num in nums]
+
+    def last_page(self):
+        return -(-self.newest // per_page)
+
+    async def crawl_board(self, board, page: int, refresh: bool = False):
+        if self.down:
+            return {'status_code': 502}
+        if page > self.last_page():
+            return {'status_code': 200, 'last_page': -1, 'posts': []}
+
+        return {'status_code': 200, 'last_page': self.last_page(), 'posts': self.page(page)}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = PostStore(str(tmp_path / 'posts.sqlite3'))
+    monkeypatch.setattr(feed, 'store', store)
+    return store
+
+
+@pytest.fixture
+def upstreams(monkeypatch):
+    upstreams = {'cse_notice': Upstream(95), 'school_general_notice': Upstream(42)}
+
+    async def crawl_board(board, page: int, refresh: bool = False):
+        return await upstreams[board.name].crawl_board(board, page, refresh)
+
+    monkeypatch.setattr(feed, 'crawl_board', crawl_board)
+    return upstreams
+
+
+def nums(posts: list):
+    return [int(post['num']) for post in posts if post['num'].isdigit()]
+
+
+def read_all(boards: list, limit: int, between=None):
+    # Follows the cursor to the end of the stream, returns every page that was served
+    pages = []
+    after = None
+    while True:
+        posts, after, truncated = asyncio.run(feed.collect(boards, after, limit))
+        pages.append(([post for board, post in posts], truncated))
+        if after is None:
+            return pages
+        if between is not None:
+            between(len(pages))
+
+
+def test_walk_extends_only_from_the_next_page(store):
+    upstream = Upstream(95)
+    assert store.stream('b', None, 100) == ([], 1)
+
+    assert store.walk('b', 1, upstream.page(1), upstream.last_page())
+    assert not store.walk('b', 3, upstream.page(3), upstream.last_page())
+    posts, next_page = store.stream('b', None, 100)
+    # The headline post is older than anything walked so far
+    assert nums(posts) == list(range(95, 85, -1)) and len(posts) == 10 and next_page == 2
+
+    assert store.walk('b', 2, upstream.page(2), upstream.last_page())
+    posts, next_page = store.stream('b', stream_key(upstream.page(1)[-1]), 100)
+    assert nums(posts) == list(range(85, 75, -1)) and next_page == 3
+
+
+def test_walk_is_complete_at_the_last_page(store):
+    upstream = Upstream(15)
+    store.walk('b', 1, upstream.page(1), upstream.last_page())
+    store.walk('b', 2, upstream.page(2), upstream.last_page())
+
+    posts, next_page = store.stream('b', None, 100)
+    assert nums(posts) == list(range(15, 0, -1)) and len(posts) == 16 and next_page is None
+
+
+def test_walk_starts_over_after_a_gap(store):
+    upstream = Upstream(95)
+    for page in (1, 2, 3):
+        store.walk('b', page, upstream.page(page), upstream.last_page())
+
+    # More than a page of new posts since the head was seen, posts 96 to 100 were never listed
+    upstream.newest = 110
+    store.walk('b', 1, upstream.page(1), upstream.last_page())
+    posts, next_page = store.stream('b', None, 100)
+    assert nums(posts) == list(range(110, 100, -1)) and next_page == 2
+
+    store.walk('b', 2, upstream.page(2), upstream.last_page())
+    posts, next_page = store.stream('b', None, 100)
+    assert nums(posts) == list(range(110, 90, -1)) and next_page == 3
+
+
+def test_stream_is_read_whole(store, upstreams):
+    boards = [registry.find('cse_notice'), registry.find('school_general_notice')]
+    pages = read_all(boards, 7)
+
+    posts = [post for page, truncated in pages for post in page]
+    assert not any(truncated for page, truncated in pages)
+    assert sorted(nums(posts)) == sorted(list(range(1, 96)) + list(range(1, 43)))
+    # The headline post is listed once per board
+    assert len(posts) == 95 + 42 + 2
+
+
+def test_cursor_survives_new_posts(store, upstreams):
+    upstream = upstreams['cse_notice']
+
+    def add_posts(served: int):
+        if served in (2, 5):
+            upstream.newest += 13
+
+    pages = read_all([registry.find('cse_notice')], 7, add_posts)
+
+    served = nums([post for page, truncated in pages for post in page])
+    assert len(served) == len(set(served))
+    assert set(range(1, 96)) <= set(served)
+
+
+def test_truncated_stream_keeps_its_cursor(store, upstreams, monkeypatch):
+    monkeypatch.setattr(config, 'FEED_MAX_PAGES', 1)
+    pages = read_all([registry.find('cse_notice')], 25)
+
+    assert pages[0][1] and nums(pages[0][0]) == list(range(95, 75, -1))
+    assert sorted(nums([post for page, truncated in pages for post in page])) == list(range(1, 96))
+
+
+def test_failed_board_holds_the_feed_back(store, upstreams):
+    boards = [registry.find('cse_notice'), registry.find('school_general_notice')]
+    upstreams['school_general_notice'].down = True
+
+    assert asyncio.run(feed.collect(boards, None, 5)) == ([], None, True)
+
+    after = ('2022-01-01', 'cse_notice', 1, 'https://example.com/1')
+    assert asyncio.run(feed.collect(boards, after, 5)) == ([], after, True)
+
+    upstreams['school_general_notice'].down = False
+    posts, after, truncated = asyncio.run(feed.collect(boards, None, 5))
+    assert len(posts) == 5 and after is not None and not truncated
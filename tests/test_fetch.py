@@ -0,0 +1,45 @@
+import asyncio
+
+import httpx
+import pytest
+
+from crawler import fetch, http_client
+from crawler.cache import MemoryCache
+
+url = 'https://example.com/board'
+
+
+def parse_board(html: str, with_last_page: bool):
+    return {'html': html, 'last_page': 1 if with_last_page else None}
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    # Answers 304 whenever the client already has the current ETag
+    requests = []
+
+    async def get(url: str, headers: dict = None):
+        requests.append(dict(headers or {}))
+        if (headers or {}).get('If-None-Match') == '"v1"':
+            return httpx.Response(304, request=httpx.Request('GET', url))
+        return httpx.Response(200, text='<ul><li>post</li></ul>', headers={'ETag': '"v1"'},
+                              request=httpx.Request('GET', url))
+
+    monkeypatch.setattr(http_client, 'get', get)
+    monkeypatch.setattr(fetch, 'page_cache', MemoryCache('upstream_page', max_len=10, max_age_seconds=60))
+    return requests
+
+
+def test_validators_are_sent_when_arguments_change(upstream):
+    first = asyncio.run(fetch.fetch_parsed(url, parse_board, True))
+    same = asyncio.run(fetch.fetch_parsed(url, parse_board, True))
+    assert first == same == (200, {'html': '<ul><li>post</li></ul>', 'last_page': 1})
+    assert upstream[1] == {'If-None-Match': '"v1"'}
+
+    # The stored result was parsed with the pagination, a 304 cannot stand in for one without it
+    status_code, result = asyncio.run(fetch.fetch_parsed(url, parse_board, False))
+    assert upstream[2] == {'If-None-Match': '"v1"'} and upstream[3] == {}
+    assert status_code == 200 and result['last_page'] is None
+
+    asyncio.run(fetch.fetch_parsed(url, parse_board, False))
+    assert upstream[4] == {'If-None-Match': '"v1"'} and len(upstream) == 5
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+import config
+from crawler import html_parser
+from crawler.v2.cse_crawler import parse_cse_article, parse_cse_board
+from crawler.v2.department_common_crawler import parse_department_article, parse_department_board
+from crawler.v2.dorm_crawler import parse_dorm_article, parse_dorm_board
+from crawler.v2.school_crawler import parse_school_article, parse_school_board
+
+fixtures = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+# Fixture, parse function and its extra arguments, as the crawlers call them
+cases = [
+    ('cse_board.html', parse_cse_board, (True,)),
+    ('cse_article.html', parse_cse_article, ()),
+    ('school_board.html', parse_school_board, ('list', 'MN230', True)),
+    ('school_board.html', parse_school_board, ('scholarList', 'MN231', True)),
+    ('school_article.html', parse_school_article, ()),
+    ('dorm_board.html', parse_dorm_board, ('notice', True)),
+    ('dorm_article.html', parse_dorm_article, ()),
+    ('department_board.html', parse_department_board, (False, True)),
+    ('department_board.html', parse_department_board, (True, False)),
+    ('department_article.html', parse_department_article, ()),
+]
+
+
+def read_fixture(name: str):
+    with open(os.path.join(fixtures, name), encoding='utf-8') as file:
+        return file.read()
+
+
+def parse_with(backend: str, monkeypatch, parse, html: str, args: tuple):
+    monkeypatch.setattr(config, 'HTML_PARSER', backend)
+    return parse(html, *args)
+
+
+@pytest.mark.parametrize('name, parse, args', cases)
+def test_fixture_is_parsed(name, parse, args, monkeypatch):
+    result = parse_with('html.parser', monkeypatch, parse, read_fixture(name), args)
+
+    # Board parsers return (last_page, posts), a failed parse gives None for the posts or the article
+    if isinstance(result, tuple):
+        assert result[1]
+    else:
+        assert result is not None
+
+
+@pytest.mark.parametrize('backend', [backend for backend in html_parser.parsers if backend != 'html.parser'])
+@pytest.mark.parametrize('name, parse, args', cases)
+def test_backend_matches_html_parser(backend, name, parse, args, monkeypatch):
+    html = read_fixture(name)
+    expected = parse_with('html.parser', monkeypatch, parse, html, args)
+
+    assert parse_with(backend, monkeypatch, parse, html, args) == expected
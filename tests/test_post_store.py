@@ -0,0 +1,28 @@
+import sqlite3
+
+from crawler.post_store import PostStore, plain_text
+
+
+def test_inline_tags_do_not_split_words():
+    assert plain_text('<p><strong>9월 5일</strong>부터입니다</p>') == '9월 5일부터입니다'
+    assert plain_text('<span style="color: red">장</span><font>학금</font>&nbsp;신청') == '장학금 신청'
+    assert plain_text('<div>첫 줄<br/>둘째 줄</div><table><tr><td>가</td><td>나</td></tr></table>') == \
+        '첫 줄 둘째 줄 가 나'
+
+
+def test_search_index_is_built_again_from_an_older_store(tmp_path):
+    path = str(tmp_path / 'posts.sqlite3')
+    store = PostStore(path)
+    store.add('b', [{'num': '1', 'title': '공지', 'article_url': 'https://example.com/1',
+                     'write_date': '2022.09.01'}])
+    store.store_article('https://example.com/1', {'text': '<b>장</b>학금'})
+
+    # A store indexed before inline tags were joined
+    connection = sqlite3.connect(path)
+    connection.execute("UPDATE search_index SET body = '장 학금'")
+    connection.execute("PRAGMA user_version = 0")
+    connection.commit()
+    connection.close()
+
+    total, posts = PostStore(path).search('장학금')
+    assert total == 1 and posts[0][1]['title'] == '공지'